@@ -0,0 +1,46 @@
+"""Benchmark of many small missions, one by one and in a batch.
+
+Usage: python -m benchmarks.batch [MISSIONS]
+"""
+import random
+import sys
+import time
+
+from src.seat_code_mowers.batch import MissionBatchRunner
+from src.seat_code_mowers.input_processor import process_input
+
+
+PROGRAMS = ["LMLMLMLMM", "MMRMMRMRRM", "MMMMLMMMMRMM", "RMMLMMRMMLMM"]
+
+
+def _mission(generator: random.Random) -> str:
+    lines = ["15 15", "O 15 0 15 15"]
+    for x in range(4):
+        lines += [f"{x + 4} {generator.randrange(1, 5)} N", generator.choice(PROGRAMS)]
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    """Print the throughput of process_input and of the batch runner."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    generator = random.Random(0)
+    missions = [_mission(generator) for _ in range(count)]
+
+    start = time.perf_counter()
+    for mission in missions:
+        process_input(mission)
+    elapsed = time.perf_counter() - start
+    print(f"process_input: {count / elapsed:,.0f} missions/s")
+
+    runner = MissionBatchRunner()
+    for _ in runner.run(missions):
+        pass
+    stats = runner.stats
+    print(
+        f"batch runner: {stats.missions_per_second:,.0f} missions/s, "
+        f"{stats.instructions_per_second:,.0f} instructions/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
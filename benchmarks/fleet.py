@@ -0,0 +1,45 @@
+"""Benchmark of copy-on-write forks of a big fleet.
+
+Builds a fleet of a million Mowers, forks it many times and runs a few
+Mowers in every fork, printing the average time to fork.
+
+Usage: python -m benchmarks.fleet [MOWERS] [FORKS]
+"""
+import random
+import sys
+import time
+
+from src.seat_code_mowers.domain import Coordinates
+from src.seat_code_mowers.domain import Heading
+from src.seat_code_mowers.exceptions import InvalidMovementError
+from src.seat_code_mowers.fleet import FleetState
+
+
+def main() -> None:
+    """Print the time to build, fork and run speculative forks of a fleet."""
+    mowers = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    forks = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    side = int((2 * mowers) ** 0.5) + 1
+
+    start = time.perf_counter()
+    base = FleetState(side - 1, side - 1)
+    for index in range(mowers):
+        base.add_mower(Coordinates(index % side, index // side * 2), Heading.NORTH)
+    print(f"{mowers:,} mowers built in {time.perf_counter() - start:.2f}s")
+
+    generator = random.Random(0)
+    fork_time = 0.0
+    for _ in range(forks):
+        start = time.perf_counter()
+        fork = base.fork()
+        fork_time += time.perf_counter() - start
+        for index in generator.sample(range(mowers), 10):
+            try:
+                fork.send_instructions(index, "MRMLM")
+            except InvalidMovementError:
+                pass
+    print(f"fork: {1000 * fork_time / forks:.3f}ms on average")
+
+
+if __name__ == "__main__":
+    main()
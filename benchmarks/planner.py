@@ -0,0 +1,39 @@
+"""Benchmark of the coverage planner in a big field.
+
+Usage: python -m benchmarks.planner [SIZE] [MOWERS]
+"""
+import sys
+import time
+
+from src.seat_code_mowers.domain import Coordinates
+from src.seat_code_mowers.domain import Heading
+from src.seat_code_mowers.domain import Plateau
+from src.seat_code_mowers.obstacles import ObstacleMap
+from src.seat_code_mowers.planner import plan_coverage
+
+
+def main() -> None:
+    """Print the time to plan a field and the makespan of the plans."""
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    mowers = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    starts = [
+        (Coordinates(i * size // mowers, 0), Heading.NORTH) for i in range(mowers)
+    ]
+    obstacles = [
+        (size // 20, size // 20, size // 10, size // 5),
+        (size // 2, size // 3, size - size // 10, size // 3 + size // 100),
+        (size // 3 + 1, size // 2, size // 3 + size // 50, size - 1),
+    ]
+    plateau = Plateau(size - 1, size - 1, obstacles=ObstacleMap(obstacles))
+
+    start = time.perf_counter()
+    plans = plan_coverage(plateau, starts)
+    elapsed = time.perf_counter() - start
+
+    lengths = [len(plan) for plan in plans]
+    print(f"{size}x{size} field, {mowers} mowers: planned in {elapsed:.2f}s")
+    print(f"makespan {max(lengths):,} instructions, shortest {min(lengths):,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark of copy-on-write forks of a big service.
+
+Builds a service of many Mowers, forks it and forks the fork many times,
+running a few Mowers in every fork, printing the time and memory to fork.
+
+Usage: python -m benchmarks.service_fork [MOWERS] [FORKS]
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+from src.seat_code_mowers.exceptions import InvalidMovementError
+from src.seat_code_mowers.service import MowerService
+
+
+def main() -> None:
+    """Print the time to build, fork and run speculative forks of a service."""
+    mowers = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    forks = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    start = time.perf_counter()
+    mower_service = MowerService()
+    mower_ids = [
+        mower_service.create_mower("N", (index % 10, 0), (9, 9))
+        for index in range(mowers)
+    ]
+    print(f"{mowers:,} mowers built in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    base = mower_service.fork()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    mower_service.fork()
+    memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"service fork: {1000 * elapsed:.1f}ms, {memory / 2 ** 20:.1f}MB")
+
+    generator = random.Random(0)
+    fork_time = 0.0
+    for _ in range(forks):
+        start = time.perf_counter()
+        fork = base.fork()
+        fork_time += time.perf_counter() - start
+        for mower_id in generator.sample(mower_ids, 10):
+            try:
+                fork.send_instructions(mower_id, "MRMLM")
+            except InvalidMovementError:
+                pass
+    print(f"fork: {1000 * fork_time / forks:.3f}ms on average")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark of a thread safe plateau driven from several threads.
+
+Every thread drives its own Mowers in a shared plateau. On CPython builds
+with the GIL the throughput stays flat; on free-threaded builds it should
+scale with the number of threads.
+
+Usage: python -m benchmarks.threads [MAX_THREADS]
+"""
+import random
+import sys
+import threading
+import time
+import uuid
+
+from src.seat_code_mowers.domain import Coordinates
+from src.seat_code_mowers.domain import Heading
+from src.seat_code_mowers.domain import Movement
+from src.seat_code_mowers.domain import Mower
+from src.seat_code_mowers.domain import Plateau
+from src.seat_code_mowers.exceptions import InvalidMovementError
+
+
+MOWERS = 64
+INSTRUCTIONS = 20_000
+
+
+def _drive(mowers, instructions):
+    for mower in mowers:
+        for instruction in instructions:
+            try:
+                mower.move(instruction)
+            except InvalidMovementError:
+                pass
+
+
+def run(threads: int) -> float:
+    """Move all the Mowers with a number of threads.
+
+    Args:
+        threads: Number of threads.
+
+    Returns:
+        Movements per second.
+    """
+    plateau = Plateau(255, 255, thread_safe=True)
+    mowers = [
+        Mower(uuid.uuid4(), Coordinates(x * 32, y * 32), Heading.NORTH, plateau)
+        for x in range(8)
+        for y in range(8)
+    ]
+    instructions = [
+        Movement(instruction)
+        for instruction in random.Random(0).choices("LRMMM", k=INSTRUCTIONS)
+    ]
+    workers = [
+        threading.Thread(target=_drive, args=(mowers[i::threads], instructions))
+        for i in range(threads)
+    ]
+
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return MOWERS * INSTRUCTIONS / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Print the throughput for an increasing number of threads."""
+    max_threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+
+    baseline = None
+    threads = 1
+    while threads <= max_threads:
+        throughput = run(threads)
+        baseline = baseline or throughput
+        print(
+            f"{threads:3d} threads: {throughput:12,.0f} moves/s "
+            f"({throughput / baseline:.2f}x)"
+        )
+        threads *= 2
+
+
+if __name__ == "__main__":
+    main()
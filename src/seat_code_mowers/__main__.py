@@ -0,0 +1,68 @@
+"""Command-line interface."""
+from typing import Optional
+from typing import TextIO
+from typing import Tuple
+
+import click
+
+from .exceptions import MowerBaseError
+
+
+@click.command()
+@click.version_option()
+@click.argument("missions", nargs=-1, type=click.File("r"))
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    help="Unix socket of a worker that processes the missions.",
+)
+@click.option(
+    "--serve",
+    is_flag=True,
+    help="Run a worker listening on the --socket path instead.",
+)
+def main(
+    missions: Tuple[TextIO, ...], socket_path: Optional[str], serve: bool
+) -> None:
+    """Seat Code Mowers.
+
+    Process the MISSIONS files (standard input by default) and print the final
+    status of the Mowers. With --socket the missions are sent to a warm worker
+    started with --serve, avoiding the startup cost of every invocation.
+    """
+    if serve:
+        if socket_path is None:
+            raise click.UsageError("--serve requires --socket")
+
+        from .worker import serve as serve_worker
+
+        serve_worker(socket_path)
+        return
+
+    if socket_path is None:
+        from .input_processor import process_input
+        from .output import StreamSink
+
+        output = StreamSink()
+
+        def run(mission: str) -> None:
+            process_input(mission, output=output)
+
+    else:
+        from .worker import submit
+
+        def run(mission: str) -> None:
+            click.echo(submit(socket_path, mission), nl=False)
+
+    for mission in missions or (click.open_file("-"),):
+        try:
+            run(mission.read())
+        except MowerBaseError as ex:
+            raise click.ClickException(str(ex)) from ex
+        except ValueError as ex:  # An invalid instruction, named as by a worker.
+            raise click.ClickException(f"{type(ex).__name__}: {ex}") from ex
+
+
+if __name__ == "__main__":
+    main(prog_name="seat-code-mowers")  # pragma: no cover
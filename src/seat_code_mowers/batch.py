@@ -0,0 +1,223 @@
+"""Batch runner of many missions.
+
+Running missions one by one through :func:`process_input` pays the setup of
+every mission again: a new service, parsing the plateau and the obstacles
+and grouping the instructions. A :class:`MissionBatchRunner` keeps them
+warm across missions, so thousands of small missions run at steady-state
+speed: the service is reset instead of created, headers and instruction
+programs are cached and the status lines are written to a reused buffer.
+"""
+import glob
+import os
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from .exceptions import InvalidInputError
+from .exceptions import MowerBaseError
+from .input_processor import parse_header
+from .input_processor import parse_mower
+from .input_processor import split_mission
+from .output import BytearraySink
+from .service import compile_instructions
+from .service import MowerService
+
+
+Mission = Union[str, "os.PathLike[str]"]
+
+
+@dataclass(frozen=True)
+class MissionResult:
+    """The result of a mission.
+
+    Attributes:
+        source: The path of the mission, or ``<string>``.
+        output: The final status of every Mower, one per line, or None when
+            the mission failed.
+        error: The error raised by the mission, if any.
+        mowers: Number of Mowers driven.
+        instructions: Number of instructions sent.
+        elapsed: Seconds spent running the mission.
+    """
+
+    source: str
+    output: Optional[str]
+    error: Optional[Exception]
+    mowers: int
+    instructions: int
+    elapsed: float
+
+
+@dataclass
+class BatchStats:
+    """Aggregated throughput of the missions run.
+
+    Attributes:
+        missions: Number of missions run.
+        failed: Number of missions that raised an error.
+        mowers: Number of Mowers driven.
+        instructions: Number of instructions sent.
+        elapsed: Seconds spent running the missions.
+    """
+
+    missions: int = 0
+    failed: int = 0
+    mowers: int = 0
+    instructions: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def missions_per_second(self) -> float:
+        """Missions run per second."""
+        return self.missions / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def instructions_per_second(self) -> float:
+        """Instructions sent per second."""
+        return self.instructions / self.elapsed if self.elapsed else 0.0
+
+    def add(self, result: MissionResult) -> None:
+        """Add the result of a mission.
+
+        Args:
+            result: The result of the mission.
+        """
+        self.missions += 1
+        self.failed += result.error is not None
+        self.mowers += result.mowers
+        self.instructions += result.instructions
+        self.elapsed += result.elapsed
+
+
+def find_missions(pattern: str) -> List[Path]:
+    """Find the mission files matching a glob pattern.
+
+    Args:
+        pattern: The pattern, ie: "missions/**/*.txt".
+
+    Returns:
+        The matching files, sorted.
+    """
+    return sorted(
+        Path(path)
+        for path in glob.glob(pattern, recursive=True)
+        if os.path.isfile(path)
+    )
+
+
+class MissionBatchRunner:
+    """Runs many missions reusing the service, caches and buffers."""
+
+    def __init__(
+        self,
+        header_cache_size: int = 256,
+        program_cache_size: int = 4096,
+        output_size_hint: int = 4096,
+    ):
+        """Initialize the runner.
+
+        Args:
+            header_cache_size: Number of parsed plateaus and obstacles kept.
+            program_cache_size: Number of compiled instruction programs kept.
+            output_size_hint: The initial size of the output buffer in bytes.
+        """
+        self._service = MowerService()
+        self._parse_header = lru_cache(maxsize=header_cache_size)(parse_header)
+        self._compile = lru_cache(maxsize=program_cache_size)(compile_instructions)
+        self._output = BytearraySink(output_size_hint)
+        self.stats = BatchStats()
+
+    def run(self, missions: Iterable[Mission]) -> Iterator[MissionResult]:
+        """Run missions, yielding every result as soon as it finishes.
+
+        A mission failing with an invalid input, movement or instruction
+        doesn't stop the batch, its error is in the result.
+
+        Strings are always mission inputs: give the paths of mission files
+        and directories and the glob patterns as paths, or find them first
+        with :func:`find_missions`.
+
+        Args:
+            missions: Mission inputs, paths of mission files, paths of
+                directories whose files are all missions or glob patterns of
+                mission files, ie: ``Path("missions/**/*.txt")``.
+
+        Yields:
+            The result of every mission, in order.
+        """
+        for source, mission in _read_missions(missions):
+            yield self.run_mission(mission, source)
+
+    def run_mission(self, mission: str, source: str = "<string>") -> MissionResult:
+        """Run a mission.
+
+        Args:
+            mission: The plateau followed by the Mowers and their instructions,
+                as in :func:`process_input`.
+            source: The name of the mission in the result.
+
+        Returns:
+            The result of the mission.
+        """
+        counts = [0, 0]
+        start = time.perf_counter()
+        try:
+            self._execute(mission, counts)
+        except (MowerBaseError, ValueError) as ex:
+            output, error = None, ex
+        else:
+            output, error = self._output.getvalue().decode(), None
+        finally:
+            elapsed = time.perf_counter() - start
+            self._output.clear()
+            self._service.reset()
+
+        result = MissionResult(source, output, error, counts[0], counts[1], elapsed)
+        self.stats.add(result)
+        return result
+
+    def _execute(self, mission: str, counts: List[int]) -> None:
+        try:
+            header, mowers = split_mission(mission)
+            upper_right_coords, obstacles = self._parse_header(header)
+        except ValueError as verr:
+            raise InvalidInputError(f"Unprocessable input: {mission}") from verr
+
+        for mower in mowers:
+            try:
+                coords, heading = parse_mower(mower[0])
+                mower_id = self._service.create_mower(
+                    heading, coords, upper_right_coords, obstacles=obstacles
+                )
+            except (IndexError, ValueError) as ex:
+                raise InvalidInputError(f"Unprocessable input: {mission}") from ex
+
+            instructions = mower[1]
+            counts[0] += 1
+            counts[1] += len(instructions)
+            self._service.send_program(mower_id, self._compile(instructions))
+            self._service.write_mower_status(mower_id, self._output)
+
+
+def _read_missions(missions: Iterable[Mission]) -> Iterator[Tuple[str, str]]:
+    for mission in missions:
+        if isinstance(mission, str):
+            yield "<string>", mission
+            continue
+
+        path = Path(mission)
+        if path.is_dir():
+            files = sorted(p for p in path.iterdir() if p.is_file())
+        elif glob.escape(str(path)) != str(path):
+            files = find_missions(str(path))
+        else:
+            files = [path]
+        for file in files:
+            yield str(file), file.read_text()
@@ -0,0 +1,136 @@
+"""Coverage recording of the cells visited by the Mowers.
+
+The visited cells are stored in a tiled bitmap: the plateau is split in square
+tiles and every tile is a Python ``int`` used as a bit set. Only the tiles a
+Mower has visited are allocated, so big plateaus stay cheap, and merging the
+bitmaps of a fleet is a bulk OR of integers.
+"""
+from typing import Dict
+from typing import Iterable
+from typing import Tuple
+
+from .domain import Coordinates
+from .domain import FORWARD_STEPS
+from .domain import Heading
+
+
+TILE_SIZE = 64
+
+
+def _count_bits(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+class CoverageRecorder:
+    """Records the cells covered in a plateau."""
+
+    def __init__(self, upper_right_x: int, upper_right_y: int):
+        """Initialize an empty recorder for a plateau.
+
+        Args:
+            upper_right_x: Upper-right X coordinates of the plateau.
+            upper_right_y: Upper-right Y coordinates of the plateau.
+        """
+        self._upper_right_x = upper_right_x
+        self._upper_right_y = upper_right_y
+        self._tiles: Dict[Tuple[int, int], int] = {}
+        self._visits = 0
+
+    @property
+    def plateau_size(self) -> Tuple[int, int]:
+        """The upper-right coordinates of the recorded plateau."""
+        return self._upper_right_x, self._upper_right_y
+
+    @property
+    def visits(self) -> int:
+        """Number of cells visited, counting revisits."""
+        return self._visits
+
+    @property
+    def covered_cells(self) -> int:
+        """Number of unique cells covered."""
+        return sum(_count_bits(bits) for bits in self._tiles.values())
+
+    @property
+    def overlap(self) -> int:
+        """Number of visits to cells that were already covered."""
+        return self._visits - self.covered_cells
+
+    @property
+    def percentage(self) -> float:
+        """Percentage of the plateau covered."""
+        total_cells = (self._upper_right_x + 1) * (self._upper_right_y + 1)
+        return 100.0 * self.covered_cells / total_cells
+
+    def mark(self, coordinates: Coordinates) -> None:
+        """Mark a cell as covered.
+
+        Args:
+            coordinates: The covered cell.
+        """
+        tile_x, offset_x = divmod(coordinates.x, TILE_SIZE)
+        tile_y, offset_y = divmod(coordinates.y, TILE_SIZE)
+        tile = (tile_x, tile_y)
+        self._tiles[tile] = self._tiles.get(tile, 0) | (
+            1 << (offset_y * TILE_SIZE + offset_x)
+        )
+        self._visits += 1
+
+    def mark_run(self, start: Coordinates, heading: Heading, steps: int) -> None:
+        """Mark the cells crossed moving forward from a cell, excluding it.
+
+        Args:
+            start: The cell the run starts from.
+            heading: The heading of the run.
+            steps: The number of forward movements.
+        """
+        step_x, step_y = FORWARD_STEPS[heading]
+        for step in range(1, steps + 1):
+            self.mark(Coordinates(start.x + step * step_x, start.y + step * step_y))
+
+    def is_covered(self, coordinates: Coordinates) -> bool:
+        """Tells if a cell has been covered.
+
+        Args:
+            coordinates: The cell.
+
+        Returns:
+            True when the cell has been covered.
+        """
+        tile_x, offset_x = divmod(coordinates.x, TILE_SIZE)
+        tile_y, offset_y = divmod(coordinates.y, TILE_SIZE)
+        bits = self._tiles.get((tile_x, tile_y), 0)
+        return bool(bits >> (offset_y * TILE_SIZE + offset_x) & 1)
+
+    @classmethod
+    def merge(cls, recorders: Iterable["CoverageRecorder"]) -> "CoverageRecorder":
+        """Merge the coverage of several recorders of the same plateau.
+
+        The visits of the merged recorder are the sum of all the visits, so
+        its overlap includes the cells covered by more than one recorder.
+
+        Args:
+            recorders: The recorders to merge.
+
+        Returns:
+            A new recorder with the union of the covered cells.
+
+        Raises:
+            ValueError: When the recorders belong to plateaus of different size.
+        """
+        recorders = list(recorders)
+        if not recorders:
+            raise ValueError("Nothing to merge")
+
+        merged = cls(*recorders[0].plateau_size)
+        for recorder in recorders:
+            if recorder.plateau_size != merged.plateau_size:
+                raise ValueError(
+                    f"Cannot merge coverage of plateaus '{merged.plateau_size}' "
+                    f"and '{recorder.plateau_size}'"
+                )
+            for tile, bits in recorder._tiles.items():
+                merged._tiles[tile] = merged._tiles.get(tile, 0) | bits
+            merged._visits += recorder._visits
+
+        return merged
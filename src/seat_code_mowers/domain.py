@@ -2,15 +2,26 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from dataclasses import field
 from enum import Enum
+from typing import Callable
+from typing import Optional
+from typing import TYPE_CHECKING
 from uuid import UUID
 
-from src.seat_code_mowers.exceptions import InvalidMovementError
+from .exceptions import InvalidMovementError
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .coverage import CoverageRecorder
+    from .obstacles import ObstacleMap
 
 
 BOTTOM_LEFT_X_COORDINATE = 0
 BOTTOM_LEFT_Y_COORDINATE = 0
 
+LOCK_TILE_SIZE = 16
+LOCK_STRIPES = 64
+
 
 class Movement(str, Enum):
     """Possible movements."""
@@ -39,6 +50,15 @@ class Heading(str, Enum):
         return self is Heading.NORTH or self is Heading.SOUTH
 
 
+FORWARD_STEPS = {
+    Heading.NORTH: (0, 1),
+    Heading.EAST: (1, 0),
+    Heading.SOUTH: (0, -1),
+    Heading.WEST: (-1, 0),
+}
+QUARTER_TURNS = {Movement.LEFT_90_DEGREES: -1, Movement.RIGHT_90_DEGREES: 1}
+
+
 @dataclass(unsafe_hash=True)
 class Coordinates:
     """Represents a location in space."""
@@ -75,18 +95,53 @@ def calculate_heading(current_heading: Heading, movement: Movement) -> Heading:
 
 
 class Plateau:
-    """Representation of a plateau."""
-
-    def __init__(self, upper_right_x: int, upper_right_y: int):
+    """Representation of a plateau.
+
+    A thread safe plateau splits its cells in square tiles guarded by a pool
+    of striped locks, so Mowers in different tiles can move concurrently. A
+    movement takes the locks of its origin and destination tiles always in
+    the order of the pool, which prevents deadlocks.
+    """
+
+    def __init__(
+        self,
+        upper_right_x: int,
+        upper_right_y: int,
+        thread_safe: bool = False,
+        obstacles: Optional[ObstacleMap] = None,
+    ):
         """Initialize plateau with the upper-right coordinates.
 
         Args:
             upper_right_x: Upper-right X coordinates of the plateau.
             upper_right_y: Upper-right Y coordinates of the plateau.
+            thread_safe: Allow moving Mowers from several threads.
+            obstacles: The cells blocked by static obstacles.
         """
         self._upper_right_x = upper_right_x
         self._upper_right_y = upper_right_y
+        self._obstacles = obstacles
         self._coordinates = dict()
+        self._tile_locks = None
+        if thread_safe:
+            import threading
+
+            self._tile_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+    @property
+    def upper_right_x(self) -> int:
+        """Upper-right X coordinates of the plateau."""
+        return self._upper_right_x
+
+    @property
+    def upper_right_y(self) -> int:
+        """Upper-right Y coordinates of the plateau."""
+        return self._upper_right_y
+
+    @property
+    def obstacles(self) -> Optional[ObstacleMap]:
+        """The cells blocked by static obstacles, if any."""
+        return self._obstacles
 
     def add_mower(self, mower: Mower):
         """Add a mower to the plateau.
@@ -94,7 +149,16 @@ class Plateau:
         Args:
             mower: The mower.
         """
-        self._coordinates[mower.location] = mower
+        if self._tile_locks is None:
+            self._coordinates[mower.location] = mower
+            return
+
+        locks = self._tile_locks_of(mower.location)
+        self._acquire(locks)
+        try:
+            self._coordinates[mower.location] = mower
+        finally:
+            self._release(locks)
 
     def calculate_new_position_after_forward_movement(
         self, current_position: Coordinates, heading: Heading
@@ -112,20 +176,159 @@ class Plateau:
             InvalidMovementError: When it can't move with that heading.
         """
         coordinates = self._calculate_new_position(current_position, heading)
-        self._check_new_position_validity(coordinates)
-        self._save_new_position_of_mower(coordinates, current_position)
+        if self._tile_locks is None:
+            self._check_new_position_validity(coordinates)
+            self._save_new_position_of_mower(coordinates, current_position)
+            return coordinates
+
+        locks = self._tile_locks_of(current_position, coordinates)
+        self._acquire(locks)
+        try:
+            self._check_new_position_validity(coordinates)
+            self._save_new_position_of_mower(coordinates, current_position)
+        finally:
+            self._release(locks)
 
         return coordinates
 
+    def free_run(
+        self, current_position: Coordinates, heading: Heading, limit: int
+    ) -> int:
+        """Number of forward movements that can be done without errors.
+
+        The plateau bounds and the obstacles are looked up once. Mowers are
+        found scanning the plateau or probing the cells of the run, whatever
+        is cheaper. Thread safe plateaus always return 0, as the run could be
+        invalidated by other threads before jumping.
+
+        Args:
+            current_position: The current coordinates.
+            heading: The current heading.
+            limit: The maximum number of movements to check.
+
+        Returns:
+            The number of valid forward movements, up to the limit.
+        """
+        if self._tile_locks is not None:
+            return 0
+        run = min(self.clear_run(current_position, heading), limit)
+
+        x, y = current_position.x, current_position.y
+        step_x, step_y = FORWARD_STEPS[heading]
+        if len(self._coordinates) - 1 < run:
+            for other in self._coordinates:
+                distance = (other.x - x) * step_x + (other.y - y) * step_y
+                if 0 < distance <= run and (
+                    other.x - x == distance * step_x
+                    and other.y - y == distance * step_y
+                ):
+                    run = distance - 1
+        else:
+            for distance in range(1, run + 1):
+                cell = Coordinates(x + distance * step_x, y + distance * step_y)
+                if cell in self._coordinates:
+                    return distance - 1
+        return run
+
+    def clear_run(self, current_position: Coordinates, heading: Heading) -> int:
+        """Number of cells ahead inside the plateau and free of obstacles.
+
+        Mowers aren't looked up, see :meth:`free_run`.
+
+        Args:
+            current_position: The current coordinates.
+            heading: The current heading.
+
+        Returns:
+            The number of cells, 0 when the current position is out of the
+            plateau or blocked by an obstacle.
+        """
+        if not self._is_inside_plateau(current_position):
+            return 0
+        if self._obstacles is not None and self._obstacles.is_blocked(
+            current_position
+        ):
+            return 0
+
+        x, y = current_position.x, current_position.y
+        run = {
+            Heading.NORTH: self._upper_right_y - y,
+            Heading.EAST: self._upper_right_x - x,
+            Heading.SOUTH: y - BOTTOM_LEFT_Y_COORDINATE,
+            Heading.WEST: x - BOTTOM_LEFT_X_COORDINATE,
+        }[heading]
+        if self._obstacles is not None:
+            obstacle_run = self._obstacles.free_run(current_position, heading)
+            if obstacle_run is not None:
+                run = min(run, obstacle_run)
+        return run
+
+    def check_new_position(
+        self, coordinates: Coordinates, is_occupied: Callable[[Coordinates], bool]
+    ) -> None:
+        """Check a Mower can move to a cell.
+
+        Args:
+            coordinates: The cell.
+            is_occupied: Tells if a cell is occupied by a Mower.
+
+        Raises:
+            InvalidMovementError: When the cell is out of the plateau, blocked
+                by an obstacle or occupied.
+        """
+        if not self._is_inside_plateau(coordinates):
+            raise InvalidMovementError(f"'{coordinates}' out of plateau")
+        if self._obstacles is not None and self._obstacles.is_blocked(coordinates):
+            raise InvalidMovementError(f"'{coordinates}' blocked by an obstacle")
+        if is_occupied(coordinates):
+            raise InvalidMovementError(f"'{coordinates}' already occupied")
+
+    def jump(
+        self, current_position: Coordinates, heading: Heading, steps: int
+    ) -> Coordinates:
+        """Move a Mower several cells forward, previously checked by free_run.
+
+        Args:
+            current_position: The current coordinates.
+            heading: The current heading.
+            steps: The number of forward movements.
+
+        Returns:
+            The new coordinates.
+        """
+        step_x, step_y = FORWARD_STEPS[heading]
+        coordinates = Coordinates(
+            current_position.x + steps * step_x, current_position.y + steps * step_y
+        )
+        self._save_new_position_of_mower(coordinates, current_position)
+        return coordinates
+
+    def _tile_locks_of(self, *cells):
+        stripes = sorted(
+            {
+                hash((cell.x // LOCK_TILE_SIZE, cell.y // LOCK_TILE_SIZE))
+                % LOCK_STRIPES
+                for cell in cells
+            }
+        )
+        return [self._tile_locks[stripe] for stripe in stripes]
+
+    @staticmethod
+    def _acquire(locks):
+        for lock in locks:
+            lock.acquire()
+
+    @staticmethod
+    def _release(locks):
+        for lock in reversed(locks):
+            lock.release()
+
     def _save_new_position_of_mower(self, coordinates, current_position):
         self._coordinates[coordinates] = self._coordinates[current_position]
         del self._coordinates[current_position]
 
     def _check_new_position_validity(self, coordinates):
-        if not self._is_inside_plateau(coordinates):
-            raise InvalidMovementError(f"'{coordinates}' out of plateau")
-        if coordinates in self._coordinates:
-            raise InvalidMovementError(f"'{coordinates}' already occupied")
+        self.check_new_position(coordinates, self._coordinates.__contains__)
 
     @staticmethod
     def _calculate_new_position(current_position, heading):
@@ -162,15 +365,22 @@ class Plateau:
 
 @dataclass
 class Mower:
-    """Represents a Mower."""
+    """Represents a Mower.
+
+    When a coverage recorder is given, every cell the Mower stands on is
+    marked on it.
+    """
 
     id: UUID
     location: Coordinates
     heading: Heading
     plateau: Plateau
+    recorder: Optional[CoverageRecorder] = field(default=None, repr=False)
 
     def __post_init__(self):  # noqa: D105
         self.plateau.add_mower(self)
+        if self.recorder is not None:
+            self.recorder.mark(self.location)
 
     def move(self, movement: Movement) -> None:
         """Move the Mower to a new position.
@@ -190,5 +400,29 @@ class Mower:
                 )
             except InvalidMovementError:
                 raise
+            if self.recorder is not None:
+                self.recorder.mark(self.location)
         else:
             self.heading = calculate_heading(self.heading, movement)
+
+    def move_forward(self, steps: int) -> None:
+        """Move the Mower several cells forward.
+
+        Equivalent to moving forward once per step, but the valid part of the
+        run is checked and done at once.
+
+        Args:
+            steps: The number of forward movements.
+
+        Raises: # noqa: DAR402
+            InvalidMovementError: When it can't move with that heading.
+        """
+        run = self.plateau.free_run(self.location, self.heading, steps)
+        if run:
+            start = self.location
+            self.location = self.plateau.jump(self.location, self.heading, run)
+            if self.recorder is not None:
+                self.recorder.mark_run(start, self.heading, run)
+
+        for _ in range(steps - run):
+            self.move(Movement.MOVE_FORWARD)
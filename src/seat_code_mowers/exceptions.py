@@ -23,3 +23,9 @@ class InvalidInputError(MowerBaseError):
     """The input cannot be processed."""
 
     pass
+
+
+class InvalidTraceError(MowerBaseError):
+    """The trajectory trace cannot be read."""
+
+    pass
@@ -0,0 +1,443 @@
+"""Fleet states with copy-on-write forks, for what-if simulations.
+
+A :class:`FleetState` keeps the Mowers of a shared plateau in arrays instead
+of objects: the location and heading of the Mowers in pages of
+``PAGE_SIZE`` Mowers, and the occupied cells in square tiles of
+``TILE_SIZE`` cells. Forking a state copies only the tables of pages and
+tiles. Every page and tile is tagged with the token of the state that owns
+it, and a state writes in place only what it owns: shared pages and tiles
+are duplicated on their first write. So forking a fleet of a million Mowers
+takes milliseconds, and every fork duplicates only what its run touches.
+
+Forks are independent, so speculative runs from one base state can run in
+parallel, as long as the base state isn't moved while it's being forked.
+
+A :class:`ServiceFork` keeps the Mowers of a live
+:class:`~seat_code_mowers.service.MowerService` in pages too, driven by their
+ids. As every Mower of a service has its own plateau, a page also holds the
+plateau of every Mower, and there are no tiles: the Mowers don't collide.
+"""
+from array import array
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from .domain import Coordinates
+from .domain import FORWARD_STEPS
+from .domain import Heading
+from .domain import Movement
+from .domain import Mower
+from .domain import Plateau
+from .domain import QUARTER_TURNS
+from .exceptions import MowerNotFoundError
+from .service import compile_instructions
+from .service import find_mower
+from .service import Program
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .obstacles import ObstacleMap
+    from .output import OutputSink
+
+
+PAGE_SIZE = 1024
+TILE_SIZE = 64
+
+_HEADINGS = list(Heading)
+_HEADING_CODES = {heading: code for code, heading in enumerate(_HEADINGS)}
+_STEPS = [FORWARD_STEPS[heading] for heading in _HEADINGS]
+# Every Mower takes 3 values of a page: x, y and the code of its heading.
+_FIELDS = 3
+# In a service fork, the number of its plateau too.
+_SERVICE_FIELDS = 4
+
+
+class _Token:
+    """Identifies the pages and tiles a state can write in place."""
+
+
+class _Pages:
+    """Copy-on-write pages of the fields of the Mowers, by index."""
+
+    def __init__(self, fields: int):
+        self.fields = fields
+        self.size = 0
+        self.token = _Token()
+        self.pages: List[array] = []
+        self.owners: List[_Token] = []
+
+    def fork(self) -> "_Pages":
+        fork = _Pages.__new__(_Pages)
+        fork.__dict__.update(self.__dict__)
+        fork.pages = self.pages.copy()
+        fork.owners = self.owners.copy()
+        fork.token = _Token()
+        # These pages aren't owned anymore, they're shared with the fork.
+        self.token = _Token()
+        return fork
+
+    def append(self, *values: int) -> int:
+        index = self.size
+        if index % PAGE_SIZE == 0:
+            self.pages.append(array("q", bytes(8 * self.fields * PAGE_SIZE)))
+            self.owners.append(self.token)
+        self.size += 1
+
+        page, offset = self.writable(index)
+        page[offset : offset + self.fields] = array("q", values)
+        return index
+
+    def readable(self, index: int) -> Tuple[array, int]:
+        if not 0 <= index < self.size:
+            raise MowerNotFoundError(f"Mower {index} not found")
+        return self.pages[index // PAGE_SIZE], index % PAGE_SIZE * self.fields
+
+    def writable(self, index: int) -> Tuple[array, int]:
+        number = index // PAGE_SIZE
+        page = self.pages[number]
+        if self.owners[number] is not self.token:
+            page = self.pages[number] = array("q", page)
+            self.owners[number] = self.token
+        return page, index % PAGE_SIZE * self.fields
+
+
+class FleetState:
+    """Locations and headings of a fleet of Mowers sharing a plateau.
+
+    The Mowers follow the rules of a shared
+    :class:`~seat_code_mowers.domain.Plateau`: they cannot leave the plateau,
+    enter an obstacle or collide with each other. Mowers are identified by
+    their index, in the order they were added.
+    """
+
+    def __init__(
+        self,
+        upper_right_x: int,
+        upper_right_y: int,
+        obstacles: Optional["ObstacleMap"] = None,
+    ):
+        """Initialize an empty fleet.
+
+        Args:
+            upper_right_x: Upper-right X coordinates of the plateau.
+            upper_right_y: Upper-right Y coordinates of the plateau.
+            obstacles: The cells blocked by static obstacles.
+        """
+        # Only its rules are used, the Mowers are kept in the pages and tiles.
+        self._plateau = Plateau(upper_right_x, upper_right_y, obstacles=obstacles)
+        self._pages = _Pages(_FIELDS)
+        self._token = _Token()
+        self._tiles: Dict[Tuple[int, int], bytearray] = {}
+        self._tile_owners: Dict[Tuple[int, int], _Token] = {}
+
+    @classmethod
+    def from_mowers(cls, mowers: Iterable[Mower]) -> "FleetState":
+        """Build the state of Mowers sharing a plateau.
+
+        Args:
+            mowers: The Mowers, in the order of their indexes in the state.
+
+        Returns:
+            The state of the Mowers.
+
+        Raises:
+            ValueError: When there are no Mowers or they're in different
+                plateaus.
+        """
+        mowers = list(mowers)
+        if not mowers:
+            raise ValueError("No Mowers to build a fleet")
+        plateau = mowers[0].plateau
+        if any(mower.plateau is not plateau for mower in mowers):
+            raise ValueError("Mowers in different plateaus")
+
+        state = cls(plateau.upper_right_x, plateau.upper_right_y, plateau.obstacles)
+        for mower in mowers:
+            state.add_mower(mower.location, mower.heading)
+        return state
+
+    def __len__(self) -> int:
+        """Number of Mowers in the fleet."""
+        return self._pages.size
+
+    def fork(self) -> "FleetState":
+        """Branch a new state from this one.
+
+        Both states share their pages and tiles until they write them.
+
+        Returns:
+            The new state.
+        """
+        fork = FleetState.__new__(FleetState)
+        fork.__dict__.update(self.__dict__)
+        fork._pages = self._pages.fork()
+        fork._tiles = self._tiles.copy()
+        fork._tile_owners = self._tile_owners.copy()
+        fork._token = _Token()
+        # This state doesn't own its tiles anymore, they're shared.
+        self._token = _Token()
+        return fork
+
+    def add_mower(self, location: Coordinates, heading: Heading) -> int:
+        """Add a Mower to the fleet.
+
+        Args:
+            location: The initial location of the Mower.
+            heading: The initial heading of the Mower.
+
+        Returns:
+            The index of the Mower.
+        """
+        index = self._pages.append(location.x, location.y, _HEADING_CODES[heading])
+        self._set_occupied(location.x, location.y, 1)
+        return index
+
+    def location(self, index: int) -> Coordinates:
+        """Get the location of a Mower.
+
+        Args:
+            index: The index of the Mower.
+
+        Returns:
+            The location of the Mower.
+        """
+        page, offset = self._pages.readable(index)
+        return Coordinates(page[offset], page[offset + 1])
+
+    def heading(self, index: int) -> Heading:
+        """Get the heading of a Mower.
+
+        Args:
+            index: The index of the Mower.
+
+        Returns:
+            The heading of the Mower.
+        """
+        page, offset = self._pages.readable(index)
+        return _HEADINGS[page[offset + 2]]
+
+    def send_instructions(self, index: int, instructions: str) -> None:
+        """Make a Mower follow a path, see :meth:`MowerService.send_instructions`.
+
+        Args:
+            index: The index of the Mower.
+            instructions: The instructions to follow.
+        """
+        self.send_program(index, compile_instructions(instructions))
+
+    def send_program(self, index: int, program: Program) -> None:
+        """Make a Mower follow a compiled program.
+
+        Args:
+            index: The index of the Mower.
+            program: The program, see :func:`compile_instructions`.
+
+        Raises: # noqa: DAR402
+            MowerNotFoundError: When there's no Mower with that index.
+            InvalidMovementError: When it can't move with that heading.
+            ValueError: When the program has an invalid instruction.
+        """
+        self._pages.readable(index)
+        for movement, steps in program.runs:
+            if movement is Movement.MOVE_FORWARD:
+                self._move_forward(index, steps)
+            else:
+                page, offset = self._pages.writable(index)
+                turn = QUARTER_TURNS[movement] * steps
+                page[offset + 2] = (page[offset + 2] + turn) % 4
+
+        if program.invalid is not None:
+            Movement(program.invalid)  # Raises the ValueError of the instruction.
+
+    def _move_forward(self, index: int, steps: int) -> None:
+        page, offset = self._pages.readable(index)
+        x, y, code = page[offset], page[offset + 1], page[offset + 2]
+        step_x, step_y = _STEPS[code]
+        clear = self._plateau.clear_run(Coordinates(x, y), _HEADINGS[code])
+
+        self._set_occupied(x, y, 0)
+        try:
+            for step in range(1, steps + 1):
+                new_x, new_y = x + step_x, y + step_y
+                # Only Mowers can stop a Mower inside the clear run.
+                if step > clear or self._is_occupied(new_x, new_y):
+                    self._plateau.check_new_position(
+                        Coordinates(new_x, new_y), self._is_occupied_at
+                    )
+                x, y = new_x, new_y
+        finally:
+            self._set_occupied(x, y, 1)
+            page, offset = self._pages.writable(index)
+            page[offset] = x
+            page[offset + 1] = y
+
+    def _is_occupied_at(self, coordinates: Coordinates) -> bool:
+        return self._is_occupied(coordinates.x, coordinates.y)
+
+    def _is_occupied(self, x: int, y: int) -> bool:
+        tile = self._tiles.get((x // TILE_SIZE, y // TILE_SIZE))
+        return tile is not None and tile[y % TILE_SIZE * TILE_SIZE + x % TILE_SIZE]
+
+    def _set_occupied(self, x: int, y: int, occupied: int) -> None:
+        key = (x // TILE_SIZE, y // TILE_SIZE)
+        tile = self._tiles.get(key)
+        if tile is None:
+            tile = self._tiles[key] = bytearray(TILE_SIZE * TILE_SIZE)
+            self._tile_owners[key] = self._token
+        elif self._tile_owners[key] is not self._token:
+            tile = self._tiles[key] = bytearray(tile)
+            self._tile_owners[key] = self._token
+        tile[y % TILE_SIZE * TILE_SIZE + x % TILE_SIZE] = occupied
+
+
+class ServiceFork:
+    """A copy-on-write fork of the Mowers of a service, driven by their ids.
+
+    Moving the Mowers of a fork doesn't move the ones of the service nor of
+    the other forks. As in the service, every Mower has its own plateau, so
+    the Mowers don't collide with each other. The coverage of the Mowers
+    isn't recorded in a fork.
+    """
+
+    def __init__(
+        self, indexes: Dict[UUID, int], plateaus: List[Plateau], pages: _Pages
+    ):
+        """Initialize the fork.
+
+        Args:
+            indexes: The index of every Mower in the pages, by Mower id.
+            plateaus: The plateaus of the Mowers, by number.
+            pages: The location, heading and plateau number of the Mowers.
+        """
+        self._indexes = indexes
+        self._plateaus = plateaus
+        self._pages = pages
+
+    @classmethod
+    def from_mowers(cls, mowers: Iterable[Mower]) -> "ServiceFork":
+        """Build the fork of Mowers, each on its own plateau.
+
+        The plateaus of the same size and obstacles are stored once.
+
+        Args:
+            mowers: The Mowers.
+
+        Returns:
+            The fork of the Mowers.
+        """
+        indexes = {}
+        plateaus: List[Plateau] = []
+        numbers: Dict[Tuple[int, int, Optional["ObstacleMap"]], int] = {}
+        pages = _Pages(_SERVICE_FIELDS)
+        for mower in mowers:
+            plateau = mower.plateau
+            key = (plateau.upper_right_x, plateau.upper_right_y, plateau.obstacles)
+            number = numbers.get(key)
+            if number is None:
+                number = numbers[key] = len(plateaus)
+                plateaus.append(Plateau(key[0], key[1], obstacles=key[2]))
+            location = mower.location
+            indexes[mower.id] = pages.append(
+                location.x, location.y, _HEADING_CODES[mower.heading], number
+            )
+        return cls(indexes, plateaus, pages)
+
+    def __len__(self) -> int:
+        """Number of Mowers in the fork."""
+        return self._pages.size
+
+    def fork(self) -> "ServiceFork":
+        """Branch a new fork from this one, see :meth:`FleetState.fork`.
+
+        Returns:
+            The new fork.
+        """
+        return ServiceFork(self._indexes, self._plateaus, self._pages.fork())
+
+    def send_instructions(self, mower_id: str, instructions: str) -> None:
+        """Make a Mower follow a path, see :meth:`MowerService.send_instructions`.
+
+        Args:
+            mower_id: The id of the Mower.
+            instructions: The instructions to follow.
+        """
+        self.send_program(mower_id, compile_instructions(instructions))
+
+    def send_program(self, mower_id: str, program: Program) -> None:
+        """Make a Mower follow a compiled program.
+
+        Args:
+            mower_id: The id of the Mower.
+            program: The program, see :func:`compile_instructions`.
+
+        Raises: # noqa: DAR402
+            MowerNotFoundError: When it can't found a Mower by its id.
+            InvalidMovementError: When it can't move with that heading.
+            ValueError: When the program has an invalid instruction.
+        """
+        index = find_mower(self._indexes, mower_id)
+        for movement, steps in program.runs:
+            page, offset = self._pages.writable(index)
+            if movement is Movement.MOVE_FORWARD:
+                self._move_forward(page, offset, steps)
+            else:
+                turn = QUARTER_TURNS[movement] * steps
+                page[offset + 2] = (page[offset + 2] + turn) % 4
+
+        if program.invalid is not None:
+            Movement(program.invalid)  # Raises the ValueError of the instruction.
+
+    def _move_forward(self, page: array, offset: int, steps: int) -> None:
+        x, y, code, number = page[offset : offset + _SERVICE_FIELDS]
+        plateau = self._plateaus[number]
+        step_x, step_y = _STEPS[code]
+        run = min(steps, plateau.clear_run(Coordinates(x, y), _HEADINGS[code]))
+        x, y = x + run * step_x, y + run * step_y
+
+        try:
+            # Past the clear run the plateau or an obstacle stops the Mower,
+            # unless it started out of them.
+            for _ in range(steps - run):
+                plateau.check_new_position(
+                    Coordinates(x + step_x, y + step_y), _is_never_occupied
+                )
+                x, y = x + step_x, y + step_y
+        finally:
+            page[offset] = x
+            page[offset + 1] = y
+
+    def get_mower_status(self, mower_id: str) -> str:
+        """Get the status of a Mower, see :meth:`MowerService.get_mower_status`.
+
+        Args:
+            mower_id: The ID of the mower
+
+        Returns:
+            The status of the Mower (its position).
+
+        Raises: # noqa: DAR402
+            MowerNotFoundError: When it can't found a Mower by its id.
+        """
+        page, offset = self._pages.readable(find_mower(self._indexes, mower_id))
+        heading = _HEADINGS[page[offset + 2]]
+        return f"{page[offset]} {page[offset + 1]} {heading.value}"
+
+    def write_mower_status(self, mower_id: str, output: "OutputSink") -> None:
+        """Write the status of a Mower to an output sink.
+
+        Args:
+            mower_id: The ID of the mower
+            output: The sink to write the status to.
+
+        Raises: # noqa: DAR402
+            MowerNotFoundError: When it can't found a Mower by its id.
+        """
+        page, offset = self._pages.readable(find_mower(self._indexes, mower_id))
+        output.write_status(page[offset], page[offset + 1], _HEADINGS[page[offset + 2]])
+
+
+def _is_never_occupied(coordinates: Coordinates) -> bool:
+    return False
@@ -1,40 +1,192 @@
 """Input processor module."""
+from typing import BinaryIO
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import overload
 from typing import Tuple
+from typing import TYPE_CHECKING
 
-from src.seat_code_mowers.exceptions import InvalidInputError
-from src.seat_code_mowers.service import MowerService
+from .exceptions import InvalidInputError
+from .service import MowerService
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .obstacles import ObstacleMap
+    from .output import OutputSink
 
-def process_input(mowers_input: str) -> str:
-    """Process the instructions for the Mowers."""
-    lines = [lines.strip() for lines in mowers_input.split("\n") if lines]
 
-    if not lines:
-        raise InvalidInputError(f"Unprocessable input: {mowers_input}")
+RECTANGLE = "O"
+POLYGON = "P"
 
-    try:
-        upper_right_coords = tuple(int(coord) for coord in lines.pop(0).split(" "))
 
-        mowers = [lines[i : i + 2] for i in range(0, len(lines), 2)]
+@overload
+def process_input(
+    mowers_input: str, trace: Optional[BinaryIO] = None, output: None = None
+) -> str:
+    ...  # pragma: no cover
+
+
+@overload
+def process_input(
+    mowers_input: str, trace: Optional[BinaryIO], output: "OutputSink"
+) -> None:
+    ...  # pragma: no cover
+
+
+@overload
+def process_input(
+    mowers_input: str, trace: Optional[BinaryIO] = None, *, output: "OutputSink"
+) -> None:
+    ...  # pragma: no cover
+
+
+def process_input(
+    mowers_input: str,
+    trace: Optional[BinaryIO] = None,
+    output: Optional["OutputSink"] = None,
+) -> Optional[str]:
+    """Process the instructions for the Mowers.
+
+    The plateau line can be followed by static obstacles, one per line: a
+    rectangle given by two opposite corners ("O 1 1 2 3") or a polygon given
+    by its vertices ("P 0 0 4 0 0 4").
+
+    Args:
+        mowers_input: The plateau followed by the Mowers and their instructions.
+        trace: A binary stream to write the trajectory of the Mowers to, see
+            :mod:`seat_code_mowers.trajectory`.
+        output: A sink to write the final status of the Mowers to.
+
+    Returns:
+        The final status of every Mower, one per line, or None when written
+        to an output sink.
+
+    Raises: # noqa: DAR402
+        InvalidInputError: When the input cannot be processed.
+    """
+    if output is not None:
+        for mower_service, mower_id in _run_mowers(mowers_input, trace):
+            mower_service.write_mower_status(mower_id, output)
+        output.flush()
+        return None
+
+    # The sinks aren't imported to return a string, keeping the startup short.
+    return "".join(
+        mower_service.get_mower_status(mower_id) + "\n"
+        for mower_service, mower_id in _run_mowers(mowers_input, trace)
+    )
+
+
+def _run_mowers(
+    mowers_input: str, trace: Optional[BinaryIO]
+) -> Iterator[Tuple[MowerService, str]]:
+    try:
+        header, mowers = split_mission(mowers_input)
+        upper_right_coords, obstacles = parse_header(header)
     except ValueError as verr:
         raise InvalidInputError(f"Unprocessable input: {mowers_input}") from verr
 
     mower_service = MowerService()
+    trace_writer = None
+    if trace is not None:
+        from .trajectory import TrajectoryWriter
 
-    output = ""
+        trace_writer = TrajectoryWriter(trace)
 
     for mower in mowers:
         try:
-            coords = _extract_mower_coords(mower[0])
-            heading = _extract_mower_heading(mower[0])
-            mower_id = mower_service.create_mower(heading, coords, upper_right_coords)
+            coords, heading = parse_mower(mower[0])
+            mower_id = mower_service.create_mower(
+                heading, coords, upper_right_coords, obstacles=obstacles
+            )
         except (IndexError, ValueError) as ex:
             raise InvalidInputError(f"Unprocessable input: {mowers_input}") from ex
 
-        mower_service.send_instructions(mower_id, mower[1])
-        output += mower_service.get_mower_status(mower_id) + "\n"
+        mower_service.send_instructions(mower_id, mower[1], trace_writer)
+        yield mower_service, mower_id
+
+
+def split_mission(mowers_input: str) -> Tuple[Tuple[str, ...], List[List[str]]]:
+    """Split a mission in its header and its Mowers.
+
+    Args:
+        mowers_input: The plateau followed by the Mowers and their instructions.
+
+    Returns:
+        The header (the plateau and obstacle lines) and the location and
+        instructions lines of every Mower.
+
+    Raises:
+        InvalidInputError: When the input is empty or a Mower has no
+            instructions line.
+    """
+    lines = [lines.strip() for lines in mowers_input.split("\n") if lines]
+
+    if not lines:
+        raise InvalidInputError(f"Unprocessable input: {mowers_input}")
+
+    header_size = 1
+    while header_size < len(lines) and lines[header_size][:1] in (RECTANGLE, POLYGON):
+        header_size += 1
+
+    body = lines[header_size:]
+    if len(body) % 2:
+        raise InvalidInputError(f"Unprocessable input: {mowers_input}")
+
+    return tuple(lines[:header_size]), [body[i : i + 2] for i in range(0, len(body), 2)]
+
+
+def parse_header(header: Tuple[str, ...]) -> Tuple[Tuple, Optional["ObstacleMap"]]:
+    """Parse the header of a mission.
+
+    Args:
+        header: The plateau and obstacle lines, see :func:`split_mission`.
+
+    Returns:
+        The upper-right coordinates of the plateau and its obstacles, if any.
+
+    Raises: # noqa: DAR402
+        ValueError: When the header cannot be parsed.
+    """
+    upper_right_coords = tuple(int(coord) for coord in header[0].split(" "))
+    return upper_right_coords, _extract_obstacles(header[1:])
+
+
+def parse_mower(line: str) -> Tuple[Tuple, str]:
+    """Parse the location line of a Mower.
+
+    Args:
+        line: The coordinates and the heading of the Mower, ie: "1 2 N".
+
+    Returns:
+        The coordinates and the heading.
+
+    Raises: # noqa: DAR402
+        IndexError: When the line misses values.
+        ValueError: When the coordinates aren't numbers.
+    """
+    return _extract_mower_coords(line), _extract_mower_heading(line)
+
+
+def _extract_obstacles(lines: Tuple[str, ...]) -> Optional["ObstacleMap"]:
+    rectangles = []
+    polygons = []
+    for line in lines:
+        kind, *values = line.split()
+        numbers = [int(value) for value in values]
+        if kind == RECTANGLE and len(numbers) == 4:
+            rectangles.append(tuple(numbers))
+        elif kind == POLYGON and len(numbers) >= 6 and not len(numbers) % 2:
+            polygons.append(list(zip(numbers[::2], numbers[1::2])))
+        else:
+            raise ValueError(f"Invalid obstacle '{kind} {' '.join(values)}'")
+
+    if not rectangles and not polygons:
+        return None
+
+    from .obstacles import ObstacleMap
 
-    return output
+    return ObstacleMap(rectangles, polygons)
 
 
 def _extract_mower_coords(mower: str) -> Tuple:
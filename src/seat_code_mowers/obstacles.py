@@ -0,0 +1,177 @@
+"""Static obstacles and no-go zones of a plateau.
+
+Obstacles are rasterised once, when the map is built, into the sorted and
+merged intervals of blocked cells of every column and row. The free run
+from a cell, how many cells can be crossed heading somewhere before reaching
+an obstacle, is then a single binary search instead of probing every cell.
+"""
+from bisect import bisect_right
+from fractions import Fraction
+from math import ceil
+from math import floor
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from .domain import Coordinates
+from .domain import Heading
+
+
+Rectangle = Tuple[int, int, int, int]
+Polygon = Sequence[Tuple[int, int]]
+Interval = Tuple[int, int]
+
+
+class _Lines:
+    """Blocked intervals of the cells of a line (a column or a row)."""
+
+    def __init__(self, intervals: List[Interval]):
+        merged: List[List[int]] = []
+        for low, high in sorted(intervals):
+            if merged and low <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], high)
+            else:
+                merged.append([low, high])
+        self.lows = [low for low, _ in merged]
+        self.highs = [high for _, high in merged]
+
+    def is_blocked(self, position: int) -> bool:
+        index = bisect_right(self.lows, position) - 1
+        return index >= 0 and position <= self.highs[index]
+
+    def next_blocked(self, position: int) -> Optional[int]:
+        index = bisect_right(self.lows, position)
+        return self.lows[index] if index < len(self.lows) else None
+
+    def previous_blocked(self, position: int) -> Optional[int]:
+        index = bisect_right(self.highs, position - 1) - 1
+        return self.highs[index] if index >= 0 else None
+
+
+class ObstacleMap:
+    """Index of the cells blocked by static obstacles."""
+
+    def __init__(
+        self,
+        rectangles: Iterable[Rectangle] = (),
+        polygons: Iterable[Polygon] = (),
+    ):
+        """Rasterise the obstacles.
+
+        Args:
+            rectangles: Rectangles given by two opposite corners
+                (x0, y0, x1, y1), both included.
+            polygons: Polygons given by their vertices, the cells inside
+                them are blocked.
+        """
+        columns: Dict[int, List[Interval]] = {}
+        rows: Dict[int, List[Interval]] = {}
+        self._bounds: List[Rectangle] = []
+        for x0, y0, x1, y1 in rectangles:
+            x0, x1 = min(x0, x1), max(x0, x1)
+            y0, y1 = min(y0, y1), max(y0, y1)
+            self._bounds.append((x0, y0, x1, y1))
+            for x in range(x0, x1 + 1):
+                columns.setdefault(x, []).append((y0, y1))
+            for y in range(y0, y1 + 1):
+                rows.setdefault(y, []).append((x0, x1))
+        for polygon in polygons:
+            xs = [x for x, _ in polygon]
+            ys = [y for _, y in polygon]
+            self._bounds.append((min(xs), min(ys), max(xs), max(ys)))
+            for x, interval in _rasterise(polygon):
+                columns.setdefault(x, []).append(interval)
+            transposed = [(y, x) for x, y in polygon]
+            for y, interval in _rasterise(transposed):
+                rows.setdefault(y, []).append(interval)
+
+        self._columns = {x: _Lines(intervals) for x, intervals in columns.items()}
+        self._rows = {y: _Lines(intervals) for y, intervals in rows.items()}
+
+    @property
+    def bounds(self) -> List[Rectangle]:
+        """The bounding rectangle (x0, y0, x1, y1) of every obstacle."""
+        return self._bounds
+
+    def blocked_intervals(self, x: int) -> List[Interval]:
+        """Get the blocked cells of a column.
+
+        Args:
+            x: The X coordinates of the column.
+
+        Returns:
+            The sorted and merged intervals of blocked Y coordinates.
+        """
+        column = self._columns.get(x)
+        return [] if column is None else list(zip(column.lows, column.highs))
+
+    def is_blocked(self, coordinates: Coordinates) -> bool:
+        """Tells if a cell is blocked by an obstacle.
+
+        Args:
+            coordinates: The cell.
+
+        Returns:
+            True when the cell is blocked.
+        """
+        column = self._columns.get(coordinates.x)
+        return column is not None and column.is_blocked(coordinates.y)
+
+    def free_run(self, coordinates: Coordinates, heading: Heading) -> Optional[int]:
+        """Number of cells that can be crossed before reaching an obstacle.
+
+        Args:
+            coordinates: The starting cell.
+            heading: The direction of the run.
+
+        Returns:
+            The number of free cells or None when there are no obstacles.
+        """
+        if heading.is_vertical:
+            lines, line, position = self._columns, coordinates.x, coordinates.y
+        else:
+            lines, line, position = self._rows, coordinates.y, coordinates.x
+        blocked_line = lines.get(line)
+        if blocked_line is None:
+            return None
+
+        if heading is Heading.NORTH or heading is Heading.EAST:
+            blocked = blocked_line.next_blocked(position)
+            return None if blocked is None else blocked - position - 1
+        blocked = blocked_line.previous_blocked(position)
+        return None if blocked is None else position - blocked - 1
+
+
+def _rasterise(polygon: Polygon) -> Iterable[Tuple[int, Interval]]:
+    """Yield the intervals of every column inside a polygon, edges included.
+
+    The inside of every column is found with the even-odd rule, counting the
+    edges with a half-open rule so vertices aren't counted twice. The cells
+    on the edges are added to it, as the edges of rectangles are blocked.
+    Crossings are exact fractions, so cells on slanted edges are found.
+    """
+    edges = list(zip(polygon, list(polygon[1:]) + list(polygon[:1])))
+    xs = [x for x, _ in polygon]
+    for x in range(min(xs), max(xs) + 1):
+        intervals = []
+        crossings = sorted(
+            y0 + Fraction((y1 - y0) * (x - x0), x1 - x0)
+            for (x0, y0), (x1, y1) in edges
+            if min(x0, x1) <= x < max(x0, x1)
+        )
+        for low, high in zip(crossings[::2], crossings[1::2]):
+            intervals.append((ceil(low), floor(high)))
+
+        for (x0, y0), (x1, y1) in edges:
+            if x0 == x1 == x:
+                intervals.append((min(y0, y1), max(y0, y1)))
+            elif x0 != x1 and min(x0, x1) <= x <= max(x0, x1):
+                y = y0 + Fraction((y1 - y0) * (x - x0), x1 - x0)
+                intervals.append((ceil(y), floor(y)))
+
+        for low, high in intervals:
+            if low <= high:
+                yield x, (low, high)
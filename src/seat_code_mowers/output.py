@@ -0,0 +1,160 @@
+"""Output sinks for the status of the Mowers.
+
+Sinks receive the location and heading of the Mowers and format the status
+lines themselves, with the bytes of every heading precomputed, instead of
+building one big string.
+"""
+import sys
+from abc import ABC
+from abc import abstractmethod
+from typing import BinaryIO
+from typing import List
+from typing import Union
+
+from .domain import Heading
+
+
+HEADING_BYTES = {heading: f" {heading.value}\n".encode() for heading in Heading}
+
+
+def format_status(x: int, y: int, heading: Heading) -> bytes:
+    """Format the status line of a Mower.
+
+    Args:
+        x: The X coordinates of the Mower.
+        y: The Y coordinates of the Mower.
+        heading: The heading of the Mower.
+
+    Returns:
+        The status line, ie: b"1 2 N\\n".
+    """
+    return b"%d %d" % (x, y) + HEADING_BYTES[heading]
+
+
+class OutputSink(ABC):
+    """Base class of the output sinks."""
+
+    def write_status(self, x: int, y: int, heading: Heading) -> None:
+        """Write the status of a Mower.
+
+        Args:
+            x: The X coordinates of the Mower.
+            y: The Y coordinates of the Mower.
+            heading: The heading of the Mower.
+        """
+        self.write(format_status(x, y, heading))
+
+    @abstractmethod
+    def write(self, data: bytes) -> None:
+        """Write formatted data.
+
+        Args:
+            data: The bytes to write.
+        """
+
+    def flush(self) -> None:
+        """Flush pending data, if any."""
+        pass
+
+
+class ListSink(OutputSink):
+    """Collects the status lines and joins them once."""
+
+    def __init__(self) -> None:
+        """Initialize an empty sink."""
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> None:
+        """Write formatted data.
+
+        Args:
+            data: The bytes to write.
+        """
+        self._chunks.append(data)
+
+    def getvalue(self) -> str:
+        """Get the output written.
+
+        Returns:
+            The status lines.
+        """
+        return b"".join(self._chunks).decode()
+
+
+class BytearraySink(OutputSink):
+    """Writes the status lines in a pre-sized buffer, growing it when full."""
+
+    def __init__(self, size_hint: int = 4096):
+        """Initialize the buffer.
+
+        Args:
+            size_hint: The initial size of the buffer in bytes.
+        """
+        self._buffer = bytearray(max(size_hint, 1))
+        self._size = 0
+
+    def write(self, data: bytes) -> None:
+        """Write formatted data.
+
+        Args:
+            data: The bytes to write.
+        """
+        end = self._size + len(data)
+        if end > len(self._buffer):
+            grow = max(end, 2 * len(self._buffer)) - len(self._buffer)
+            self._buffer.extend(bytes(grow))
+        self._buffer[self._size : end] = data
+        self._size = end
+
+    def clear(self) -> None:
+        """Discard the output written, keeping the buffer for reuse."""
+        self._size = 0
+
+    def getvalue(self) -> bytes:
+        """Get the output written.
+
+        Returns:
+            The status lines.
+        """
+        return bytes(self._buffer[: self._size])
+
+
+class StreamSink(OutputSink):
+    """Writes the status lines to a binary stream in chunks of bounded size."""
+
+    def __init__(
+        self, stream: Union[BinaryIO, int, None] = None, buffer_size: int = 65536
+    ):
+        """Initialize the sink.
+
+        Args:
+            stream: The binary stream or file descriptor, the standard output
+                by default.
+            buffer_size: Bytes buffered before writing to the stream.
+        """
+        if stream is None:
+            stream = sys.stdout.buffer
+        elif isinstance(stream, int):
+            stream = open(stream, "wb", closefd=False)
+        self._stream = stream
+        self._buffer_size = buffer_size
+        self._chunks: List[bytes] = []
+        self._pending = 0
+
+    def write(self, data: bytes) -> None:
+        """Write formatted data.
+
+        Args:
+            data: The bytes to write.
+        """
+        self._chunks.append(data)
+        self._pending += len(data)
+        if self._pending >= self._buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered data to the stream."""
+        self._stream.write(b"".join(self._chunks))
+        self._stream.flush()
+        self._chunks = []
+        self._pending = 0
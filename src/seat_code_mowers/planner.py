@@ -0,0 +1,407 @@
+"""Coverage route planner.
+
+The free cells of the plateau are grouped in areas, the cells connected
+around the obstacles. Every area is split in strips of contiguous columns,
+one per Mower starting in it, sized so that the longest plan (the makespan)
+is as short as possible. Every Mower reaches its strip and covers it in a
+boustrophedon (back and forth) path, column by column, going around the
+obstacles of the plateau. The areas without Mowers can't be reached, they
+aren't covered.
+
+Plans are computed for each Mower independently, as the service gives every
+Mower its own plateau: Mowers are not considered obstacles for each other.
+"""
+from collections import deque
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from .domain import Coordinates
+from .domain import FORWARD_STEPS
+from .domain import Heading
+from .domain import Movement
+from .domain import Plateau
+
+
+Interval = Tuple[int, int]
+_Cell = List[Tuple[int, int, int]]
+# The free intervals of the columns of an area, by column.
+_Area = Dict[int, List[Interval]]
+
+_HEADINGS = list(Heading)
+_TURNS = {
+    0: "",
+    1: Movement.RIGHT_90_DEGREES.value,
+    2: Movement.RIGHT_90_DEGREES.value * 2,
+    3: Movement.LEFT_90_DEGREES.value,
+}
+# Instructions to move to the next column: turn, move and turn again.
+_COLUMN_CHANGE_COST = 3
+
+
+class _Field:
+    """The free cells of a plateau with obstacles."""
+
+    def __init__(self, plateau: Plateau):
+        self.upper_right_x = plateau.upper_right_x
+        self.upper_right_y = plateau.upper_right_y
+        self._obstacles = plateau.obstacles
+        self.bounds = [] if self._obstacles is None else self._obstacles.bounds
+
+    def column_intervals(self, x: int) -> List[Interval]:
+        blocked = (
+            [] if self._obstacles is None else self._obstacles.blocked_intervals(x)
+        )
+        intervals = []
+        start = 0
+        for y0, y1 in blocked:
+            if y0 > start:
+                intervals.append((start, min(y0 - 1, self.upper_right_y)))
+            start = max(start, y1 + 1)
+        if start <= self.upper_right_y:
+            intervals.append((start, self.upper_right_y))
+        return intervals
+
+    def is_free(self, x: int, y: int) -> bool:
+        return self.segment_is_free(x, y, x, y)
+
+    def segment_is_free(self, x1: int, y1: int, x2: int, y2: int) -> bool:
+        """Tells if a vertical or horizontal segment is free."""
+        low_x, high_x = min(x1, x2), max(x1, x2)
+        low_y, high_y = min(y1, y2), max(y1, y2)
+        if low_x < 0 or low_y < 0:
+            return False
+        if high_x > self.upper_right_x or high_y > self.upper_right_y:
+            return False
+        if self._obstacles is None:
+            return True
+
+        start = Coordinates(low_x, low_y)
+        if low_x == high_x:
+            heading, length = Heading.NORTH, high_y - low_y
+        else:
+            heading, length = Heading.EAST, high_x - low_x
+        if self._obstacles.is_blocked(start):
+            return False
+        run = self._obstacles.free_run(start, heading)
+        return run is None or run >= length
+
+
+class _Path:
+    """Builds the instructions of a Mower keeping track of its state."""
+
+    def __init__(self, field: _Field, location: Coordinates, heading: Heading):
+        self._field = field
+        self.x = location.x
+        self.y = location.y
+        self.heading = heading
+        self._chunks: List[str] = []
+
+    @property
+    def instructions(self) -> str:
+        return "".join(self._chunks)
+
+    def face(self, heading: Heading) -> None:
+        turn = (_HEADINGS.index(heading) - _HEADINGS.index(self.heading)) % 4
+        self._add(_TURNS[turn])
+        self.heading = heading
+
+    def forward(self, heading: Heading, steps: int) -> None:
+        if not steps:
+            return
+        self.face(heading)
+        self._add(Movement.MOVE_FORWARD.value * steps)
+        step_x, step_y = FORWARD_STEPS[heading]
+        self.x += step_x * steps
+        self.y += step_y * steps
+
+    def to_x(self, x: int) -> None:
+        self.forward(Heading.EAST if x > self.x else Heading.WEST, abs(x - self.x))
+
+    def to_y(self, y: int) -> None:
+        self.forward(Heading.NORTH if y > self.y else Heading.SOUTH, abs(y - self.y))
+
+    def go_to(self, x: int, y: int, window: Interval) -> None:
+        """Go to a cell with straight segments or, if blocked, a search.
+
+        The cell is in the area of the path, so the search of the whole
+        plateau always reaches it.
+        """
+        if (self.x, self.y) == (x, y):
+            return
+        for waypoints in self._detours(x, y):
+            if self._waypoints_are_free(waypoints):
+                for waypoint_x, waypoint_y in waypoints:
+                    self.to_x(waypoint_x)
+                    self.to_y(waypoint_y)
+                return
+        window = (min(window[0], self.x, x), max(window[1], self.x, x))
+        if not self._search(x, y, window):
+            self._search(x, y, (0, self._field.upper_right_x))
+
+    def _detours(self, x: int, y: int) -> Iterable[List[Tuple[int, int]]]:
+        yield [(x, self.y), (x, y)]
+        yield [(self.x, y), (x, y)]
+        bounds = self._field.bounds
+        columns = {x0 - 1 for x0, _, _, _ in bounds}
+        columns |= {x1 + 1 for _, _, x1, _ in bounds}
+        for column in sorted(columns, key=lambda c: abs(c - self.x) + abs(c - x)):
+            yield [(column, self.y), (column, y), (x, y)]
+        rows = {y0 - 1 for _, y0, _, _ in bounds}
+        rows |= {y1 + 1 for _, _, _, y1 in bounds}
+        for row in sorted(rows, key=lambda r: abs(r - self.y) + abs(r - y)):
+            yield [(self.x, row), (x, row), (x, y)]
+
+    def _waypoints_are_free(self, waypoints: List[Tuple[int, int]]) -> bool:
+        x, y = self.x, self.y
+        for waypoint_x, waypoint_y in waypoints:
+            if not self._field.segment_is_free(x, y, waypoint_x, waypoint_y):
+                return False
+            x, y = waypoint_x, waypoint_y
+        return True
+
+    def _search(self, x: int, y: int, window: Interval) -> bool:
+        """Breadth first search of the shortest path inside some columns."""
+        start = (self.x, self.y)
+        previous: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {start: None}
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            if cell == (x, y):
+                break
+            for step_x, step_y in FORWARD_STEPS.values():
+                near = (cell[0] + step_x, cell[1] + step_y)
+                if (
+                    near not in previous
+                    and window[0] <= near[0] <= window[1]
+                    and self._field.is_free(*near)
+                ):
+                    previous[near] = cell
+                    queue.append(near)
+        else:
+            return False
+
+        cells = []
+        node: Optional[Tuple[int, int]] = (x, y)
+        while node is not None:
+            cells.append(node)
+            node = previous[node]
+        for cell_x, cell_y in reversed(cells[:-1]):
+            self.to_x(cell_x)
+            self.to_y(cell_y)
+        return True
+
+    def _add(self, chunk: str) -> None:
+        if chunk:
+            self._chunks.append(chunk)
+
+
+def _areas(columns: List[List[Interval]]) -> List[_Area]:
+    """Group the free intervals of the columns in connected areas.
+
+    Intervals of consecutive columns that overlap are joined with a
+    union-find, so the areas are found without visiting every cell.
+    """
+    parents: Dict[Tuple[int, int], Tuple[int, int]] = {}
+
+    def find(node: Tuple[int, int]) -> Tuple[int, int]:
+        while parents[node] != node:
+            parents[node] = parents[parents[node]]
+            node = parents[node]
+        return node
+
+    for x, intervals in enumerate(columns):
+        for index in range(len(intervals)):
+            parents[(x, index)] = (x, index)
+        previous = columns[x - 1] if x else []
+        i = j = 0
+        while i < len(previous) and j < len(intervals):
+            if previous[i][0] <= intervals[j][1] and intervals[j][0] <= previous[i][1]:
+                parents[find((x, j))] = find((x - 1, i))
+            if previous[i][1] < intervals[j][1]:
+                i += 1
+            else:
+                j += 1
+
+    areas: Dict[Tuple[int, int], _Area] = {}
+    for x, intervals in enumerate(columns):
+        for index, interval in enumerate(intervals):
+            areas.setdefault(find((x, index)), {}).setdefault(x, []).append(interval)
+    return list(areas.values())
+
+
+def _area_of(areas: List[_Area], location: Coordinates) -> int:
+    return next(
+        number
+        for number, area in enumerate(areas)
+        for low, high in area.get(location.x, ())
+        if low <= location.y <= high
+    )
+
+
+def _partition(
+    field: _Field,
+    starts: Sequence[Coordinates],
+    free_cells: List[int],
+    order: List[int],
+    first_column: int = 0,
+) -> Dict[int, Interval]:
+    """Assign contiguous columns to the Mowers minimising the makespan.
+
+    Mowers are taken from west to east and every strip is extended while its
+    estimated cost (travel to the strip, covering its cells and changing of
+    column) is under a budget. The smallest budget covering all the columns is
+    found with a binary search. The free cells are counted from the first
+    column.
+    """
+    columns = len(free_cells)
+    prefix = [0]
+    for cells in free_cells:
+        prefix.append(prefix[-1] + cells)
+
+    def cost(mower: int, first: int, last: int) -> int:
+        start = starts[mower]
+        travel = abs(start.x - first_column - first) + min(
+            start.y, field.upper_right_y - start.y
+        )
+        covering = prefix[last + 1] - prefix[first]
+        return travel + covering + _COLUMN_CHANGE_COST * (last - first)
+
+    def assign(budget: int) -> Optional[Dict[int, Interval]]:
+        strips = {}
+        first = 0
+        for mower in order:
+            if first == columns:
+                break
+            if cost(mower, first, first) > budget:
+                continue
+            last = first
+            while last + 1 < columns and cost(mower, first, last + 1) <= budget:
+                last += 1
+            strips[mower] = (first, last)
+            first = last + 1
+        return strips if first == columns else None
+
+    low, high = 0, cost(order[0], 0, columns - 1) + columns
+    while low < high:
+        middle = (low + high) // 2
+        if assign(middle) is None:
+            low = middle + 1
+        else:
+            high = middle
+    strips = assign(low)
+    assert strips is not None  # noqa: S101
+    return {
+        mower: (first_column + first, first_column + last)
+        for mower, (first, last) in strips.items()
+    }
+
+
+def _decompose(columns: Mapping[int, List[Interval]], strip: Interval) -> List[_Cell]:
+    """Split the free cells of a strip in boustrophedon cells.
+
+    A boustrophedon cell is a run of consecutive columns where every column
+    interval overlaps only with one interval of the previous column, so it
+    can be covered back and forth without going around obstacles.
+    """
+    cells: List[_Cell] = []
+    previous: List[Tuple[int, Interval]] = []
+    for x in range(strip[0], strip[1] + 1):
+        current = []
+        for low, high in columns[x]:
+            overlapping = [
+                (cell, interval)
+                for cell, interval in previous
+                if interval[0] <= high and low <= interval[1]
+            ]
+            if len(overlapping) == 1 and _overlaps(columns[x], overlapping[0][1]) == 1:
+                cell = overlapping[0][0]
+            else:
+                cells.append([])
+                cell = len(cells) - 1
+            cells[cell].append((x, low, high))
+            current.append((cell, (low, high)))
+        previous = current
+    return cells
+
+
+def _overlaps(intervals: List[Interval], interval: Interval) -> int:
+    return sum(
+        1 for low, high in intervals if interval[0] <= high and low <= interval[1]
+    )
+
+
+def _distance(path: _Path, column: Tuple[int, int, int]) -> int:
+    x, low, high = column
+    return abs(path.x - x) + min(abs(path.y - low), abs(path.y - high))
+
+
+def _cover_strip(
+    path: _Path, columns: Mapping[int, List[Interval]], strip: Interval
+) -> None:
+    remaining = _decompose(columns, strip)
+    while remaining:
+        cell = min(
+            remaining, key=lambda c: min(_distance(path, c[0]), _distance(path, c[-1]))
+        )
+        remaining.remove(cell)
+        if _distance(path, cell[-1]) < _distance(path, cell[0]):
+            cell = cell[::-1]
+        for x, low, high in cell:
+            if abs(path.y - low) <= abs(path.y - high):
+                near, far = low, high
+            else:
+                near, far = high, low
+            path.go_to(x, near, strip)
+            path.to_y(far)
+
+
+def plan_coverage(
+    plateau: Plateau, starts: Sequence[Tuple[Coordinates, Heading]]
+) -> List[str]:
+    """Plan the instructions for a fleet to cover a plateau.
+
+    Args:
+        plateau: The plateau to cover, the Mowers don't enter its obstacles.
+        starts: The initial location and heading of every Mower.
+
+    Returns:
+        The instructions for every Mower, in the same order as the starts.
+
+    Raises:
+        ValueError: When a Mower starts out of the plateau or in an obstacle.
+    """
+    field = _Field(plateau)
+    for location, _ in starts:
+        if not field.is_free(location.x, location.y):
+            raise ValueError(f"Invalid start '{location}'")
+    areas = _areas(
+        [field.column_intervals(x) for x in range(field.upper_right_x + 1)]
+    )
+    locations = [location for location, _ in starts]
+    area_of_mowers = [_area_of(areas, location) for location in locations]
+    mowers_of_areas: Dict[int, List[int]] = {}
+    for mower, number in enumerate(area_of_mowers):
+        mowers_of_areas.setdefault(number, []).append(mower)
+
+    strips: Dict[int, Interval] = {}
+    for number, mowers in mowers_of_areas.items():
+        area = areas[number]
+        free_cells = [
+            sum(high - low + 1 for low, high in area[x])
+            for x in range(min(area), max(area) + 1)
+        ]
+        order = sorted(mowers, key=lambda mower: locations[mower].x)
+        strips.update(_partition(field, locations, free_cells, order, min(area)))
+
+    plans = []
+    for mower, (location, heading) in enumerate(starts):
+        path = _Path(field, location, heading)
+        if mower in strips:
+            _cover_strip(path, areas[area_of_mowers[mower]], strips[mower])
+        plans.append(path.instructions)
+    return plans
@@ -1,33 +1,171 @@
 """Application service."""
-import logging
+import sys
 import uuid
+from contextlib import nullcontext
+from itertools import groupby
+from typing import ContextManager
+from typing import List
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
 from typing import Tuple
+from typing import TYPE_CHECKING
+from typing import TypeVar
 
-from src.seat_code_mowers.domain import Coordinates
-from src.seat_code_mowers.domain import Heading
-from src.seat_code_mowers.domain import Movement
-from src.seat_code_mowers.domain import Mower
-from src.seat_code_mowers.domain import Plateau
-from src.seat_code_mowers.exceptions import MowerNotFoundError
+from .domain import Coordinates
+from .domain import Heading
+from .domain import LOCK_STRIPES
+from .domain import Movement
+from .domain import Mower
+from .domain import Plateau
+from .domain import QUARTER_TURNS
+from .exceptions import MowerNotFoundError
 
+if TYPE_CHECKING:  # pragma: no cover
+    from logging import Logger
 
-logger = logging.getLogger(__name__)
+    from .coverage import CoverageRecorder
+    from .fleet import ServiceFork
+    from .obstacles import ObstacleMap
+    from .output import OutputSink
+    from .trajectory import TrajectoryWriter
+
+
+T = TypeVar("T")
+
+_ROTATIONS = {
+    1: (Movement.RIGHT_90_DEGREES, 1),
+    2: (Movement.RIGHT_90_DEGREES, 2),
+    3: (Movement.LEFT_90_DEGREES, 1),
+}
+
+
+class Program(NamedTuple):
+    """Instructions compiled to runs of movements.
+
+    Attributes:
+        runs: Alternating runs of forward movements and of rotations, every
+            run of rotations reduced to its net turn.
+        invalid: The first invalid instruction, raised when reached.
+    """
+
+    runs: Tuple[Tuple[Movement, int], ...]
+    invalid: Optional[str] = None
+
+
+def compile_instructions(instructions: str) -> Program:
+    """Compile the instructions for a Mower.
+
+    Programs can be cached and sent to many Mowers, see
+    :meth:`MowerService.send_program`.
+
+    Args:
+        instructions: The instructions, ie: "LMLMLMLMM".
+
+    Returns:
+        The compiled program.
+    """
+    runs: List[Tuple[Movement, int]] = []
+    turn = 0
+    for instruction, group in groupby(instructions):
+        try:
+            movement = Movement(instruction)
+        except ValueError:
+            return Program(tuple(_close_turn(runs, turn)), instruction)
+
+        steps = sum(1 for _ in group)
+        if movement is Movement.MOVE_FORWARD:
+            runs = _close_turn(runs, turn)
+            turn = 0
+            if runs and runs[-1][0] is Movement.MOVE_FORWARD:
+                steps += runs.pop()[1]
+            runs.append((movement, steps))
+        else:
+            turn = (turn + QUARTER_TURNS[movement] * steps) % 4
+
+    return Program(tuple(_close_turn(runs, turn)))
+
+
+def _close_turn(runs, turn):
+    return runs + [_ROTATIONS[turn]] if turn else runs
+
+
+def _debug_logger() -> Optional["Logger"]:
+    # Logging can't be configured before being imported, so it's only looked
+    # up when it's already imported: short-lived runs don't pay for it.
+    if "logging" not in sys.modules:
+        return None
+
+    import logging
+
+    logger = logging.getLogger(__name__)
+    return logger if logger.isEnabledFor(logging.DEBUG) else None
+
+
+def find_mower(mowers: Mapping[uuid.UUID, T], mower_id: str) -> T:
+    """Find a Mower by its id.
+
+    Args:
+        mowers: The Mowers, or their states, by id.
+        mower_id: The id of the Mower.
+
+    Returns:
+        The Mower.
+
+    Raises:
+        MowerNotFoundError: When it can't found a Mower by its id.
+    """
+    try:
+        mower = mowers.get(uuid.UUID(mower_id))
+    except ValueError as ex:
+        raise MowerNotFoundError(f"Invalid Mower id '{mower_id}'") from ex
+
+    if mower is None:
+        raise MowerNotFoundError(f"Mower with id '{mower_id}' not found")
+
+    return mower
 
 
 class MowerService:
-    """Mowers service."""
+    """Mowers service.
+
+    A thread safe service can drive different Mowers from several threads.
+    Every Mower is guarded by one of a pool of striped locks, and its plateau
+    is thread safe as well. Another lock guards adding and removing Mowers.
+    """
+
+    def __init__(self, thread_safe: bool = False):
+        """Mowers service initializer.
 
-    def __init__(self):
-        """Mowers service initializer."""
+        Args:
+            thread_safe: Allow using the service from several threads.
+        """
         self._mowers = {}
+        self._thread_safe = thread_safe
+        self._mower_locks = None
+        self._mowers_lock = None
+        if thread_safe:
+            import threading
+
+            self._mower_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+            self._mowers_lock = threading.Lock()
 
-    def create_mower(self, heading: str, coordinates: Tuple, plateau: Tuple) -> str:
+    def create_mower(
+        self,
+        heading: str,
+        coordinates: Tuple,
+        plateau: Tuple,
+        record_coverage: bool = False,
+        obstacles: Optional["ObstacleMap"] = None,
+    ) -> str:
         """Creates a new mower.
 
         Args:
             heading: The initial heading.
             coordinates: The initial location of the Mower.
             plateau: The upper-right coordinates of the plateau.
+            record_coverage: Record the cells covered by the Mower.
+            obstacles: The static obstacles of the plateau.
 
         Returns:
             An ID for the Mower.
@@ -37,13 +175,22 @@ class MowerService:
         self._validate_coordinates(coordinates)
         self._validate_coordinates(plateau)
 
+        recorder = None
+        if record_coverage:
+            from .coverage import CoverageRecorder
+
+            recorder = CoverageRecorder(plateau[0], plateau[1])
+
         mower_id = uuid.uuid4()
-        self._mowers[mower_id] = Mower(
+        mower = Mower(
             mower_id,
             Coordinates(coordinates[0], coordinates[1]),
             mower_heading,
-            Plateau(plateau[0], plateau[1]),
+            Plateau(plateau[0], plateau[1], self._thread_safe, obstacles),
+            recorder,
         )
+        with self._lock_of_mowers():
+            self._mowers[mower_id] = mower
 
         return str(mower_id)
 
@@ -52,7 +199,12 @@ class MowerService:
         if not type(coordinates) is tuple or not len(coordinates) == 2:
             raise ValueError(f"Invalid coordinates '{coordinates}'")
 
-    def send_instructions(self, mower_id: str, instructions: str) -> None:
+    def send_instructions(
+        self,
+        mower_id: str,
+        instructions: str,
+        trace: Optional["TrajectoryWriter"] = None,
+    ) -> None:
         """Make a Mower follow a path.
 
         The possible letters are “L”, “R” and ”M”. “L” and “R” make the mower
@@ -63,26 +215,109 @@ class MowerService:
         Args:
             mower_id: The id of the Mower.
             instructions: The instructions to follow.
+            trace: A writer to record the trajectory of the Mower.
 
         Raises: # noqa: DAR402
             MowerNotFoundError: When it can't found a Mower by its id.
         """
         mower = self._get_mower(mower_id)
 
-        for instruction in instructions:
-            logger.debug(f"Sending Mower '{mower_id}' instruction '{instruction}'")
-            mower.move(Movement(instruction))
+        with self._lock_of(mower):
+            self._follow_instructions(mower, instructions, trace)
+
+    @staticmethod
+    def _follow_instructions(mower, instructions, trace):
+        debug = _debug_logger()
+
+        if trace is not None:
+            MowerService._trace_instructions(mower, instructions, trace, debug)
+            return
+
+        MowerService._follow_program(mower, compile_instructions(instructions), debug)
+
+    @staticmethod
+    def _follow_program(mower, program, debug):
+        for movement, steps in program.runs:
+            if debug is not None:
+                debug.debug(
+                    "Sending Mower '%s' instructions '%s'",
+                    mower.id,
+                    movement.value * steps,
+                )
+            if movement is Movement.MOVE_FORWARD:
+                mower.move_forward(steps)
+            else:
+                for _ in range(steps):
+                    mower.move(movement)
+
+        if program.invalid is not None:
+            Movement(program.invalid)  # Raises the ValueError of the instruction.
+
+    def send_program(self, mower_id: str, program: Program) -> None:
+        """Make a Mower follow a compiled program.
+
+        Args:
+            mower_id: The id of the Mower.
+            program: The program, see :func:`compile_instructions`.
+
+        Raises: # noqa: DAR402
+            MowerNotFoundError: When it can't found a Mower by its id.
+            ValueError: When the program has an invalid instruction.
+        """
+        mower = self._get_mower(mower_id)
+
+        with self._lock_of(mower):
+            self._follow_program(mower, program, _debug_logger())
+
+    @staticmethod
+    def _trace_instructions(mower, instructions, trace, debug):
+        trace.begin(mower.location, mower.heading)
 
-    def _get_mower(self, mower_id) -> Mower:
         try:
-            mower = self._mowers.get(uuid.UUID(mower_id))
-        except ValueError as ex:
-            raise MowerNotFoundError(f"Invalid Mower id '{mower_id}'") from ex
+            for instruction in instructions:
+                if debug is not None:
+                    debug.debug(
+                        "Sending Mower '%s' instruction '%s'", mower.id, instruction
+                    )
+                movement = Movement(instruction)
+                mower.move(movement)
+                trace.record(movement, mower.location, mower.heading)
+        finally:
+            trace.end()
+
+    def reset(self) -> None:
+        """Remove all the Mowers, so the service can be reused."""
+        with self._lock_of_mowers():
+            self._mowers.clear()
+
+    def _lock_of(self, mower: Mower) -> ContextManager:
+        if self._mower_locks is None:
+            return nullcontext()
+        return self._mower_locks[mower.id.int % LOCK_STRIPES]
+
+    def _lock_of_mowers(self) -> ContextManager:
+        if self._mowers_lock is None:
+            return nullcontext()
+        return self._mowers_lock
+
+    def _all_mowers(self) -> List[Mower]:
+        with self._lock_of_mowers():
+            return list(self._mowers.values())
+
+    def _get_mower(self, mower_id) -> Mower:
+        return find_mower(self._mowers, mower_id)
+
+    def fork(self) -> "ServiceFork":
+        """Fork the Mowers, to run what-if simulations on them.
+
+        The Mowers of the service mustn't be moved while they're being forked.
 
-        if not mower:
-            raise MowerNotFoundError(f"Mower with id '{mower_id}' not found")
+        Returns:
+            The fork, driven by the ids of the Mowers of the service.
+        """
+        from .fleet import ServiceFork
 
-        return mower
+        return ServiceFork.from_mowers(self._all_mowers())
 
     def get_mower_status(self, mower_id: str) -> str:
         """Get the status of a Mower.
@@ -101,4 +336,57 @@ class MowerService:
         """
         mower = self._get_mower(mower_id)
 
-        return f"{mower.location.x} {mower.location.y} {mower.heading}"
+        with self._lock_of(mower):
+            return f"{mower.location.x} {mower.location.y} {mower.heading.value}"
+
+    def write_mower_status(self, mower_id: str, output: "OutputSink") -> None:
+        """Write the status of a Mower to an output sink.
+
+        Args:
+            mower_id: The ID of the mower
+            output: The sink to write the status to.
+
+        Raises: # noqa: DAR402
+            MowerNotFoundError: When it can't found a Mower by its id.
+        """
+        mower = self._get_mower(mower_id)
+
+        with self._lock_of(mower):
+            output.write_status(mower.location.x, mower.location.y, mower.heading)
+
+    def get_mower_coverage(self, mower_id: str) -> "CoverageRecorder":
+        """Get the cells covered by a Mower.
+
+        Args:
+            mower_id: The ID of the mower
+
+        Returns:
+            The coverage recorder of the Mower.
+
+        Raises: # noqa: DAR402
+            MowerNotFoundError: When it can't found a Mower by its id.
+            ValueError: When the Mower isn't recording its coverage.
+        """
+        mower = self._get_mower(mower_id)
+
+        if mower.recorder is None:
+            raise ValueError(f"Mower '{mower_id}' is not recording coverage")
+
+        return mower.recorder
+
+    def get_fleet_coverage(self) -> "CoverageRecorder":
+        """Get the cells covered by all the Mowers recording their coverage.
+
+        Returns:
+            The merged coverage of the fleet.
+
+        Raises: # noqa: DAR402
+            ValueError: When there's no coverage or the plateaus differ in size.
+        """
+        from .coverage import CoverageRecorder
+
+        return CoverageRecorder.merge(
+            mower.recorder
+            for mower in self._all_mowers()
+            if mower.recorder is not None
+        )
@@ -0,0 +1,247 @@
+"""Compact binary traces of the trajectory of the Mowers.
+
+A trace starts with a header (magic ``MWTR``, version and keyframe interval)
+followed by blocks. Every block holds a keyframe, the absolute state of a
+Mower before its first movement and its number of movements, followed by
+up to ``keyframe_interval`` movements packed as 2 bits each, in as many
+bytes as they need. Blocks are written as soon as they're full, so traces
+are written incrementally, and the keyframes give the size of every block,
+so the reader can index them reading the keyframes only.
+"""
+import struct
+from typing import BinaryIO
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from .domain import calculate_heading
+from .domain import Coordinates
+from .domain import FORWARD_STEPS
+from .domain import Heading
+from .domain import Movement
+from .exceptions import InvalidTraceError
+
+
+MAGIC = b"MWTR"
+VERSION = 2
+DEFAULT_KEYFRAME_INTERVAL = 256
+
+_HEADER = struct.Struct(">4sBH")
+_KEYFRAME = struct.Struct(">IiiBH")
+
+_MOVEMENT_CODES = {
+    Movement.MOVE_FORWARD: 0,
+    Movement.LEFT_90_DEGREES: 1,
+    Movement.RIGHT_90_DEGREES: 2,
+}
+_MOVEMENTS = {code: movement for movement, code in _MOVEMENT_CODES.items()}
+_HEADINGS = list(Heading)
+_HEADING_CODES = {heading: code for code, heading in enumerate(_HEADINGS)}
+
+State = Tuple[Coordinates, Heading]
+
+
+class TrajectoryWriter:
+    """Writes the trajectory of the Mowers to a binary stream."""
+
+    def __init__(
+        self, stream: BinaryIO, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL
+    ):
+        """Initialize the writer and write the trace header.
+
+        Args:
+            stream: The binary stream to write to.
+            keyframe_interval: Number of movements between keyframes.
+
+        Raises:
+            ValueError: When the interval is not a positive multiple of 4.
+        """
+        if not 0 < keyframe_interval <= 0xFFFC or keyframe_interval % 4:
+            raise ValueError(f"Invalid keyframe interval '{keyframe_interval}'")
+
+        self._stream = stream
+        self._keyframe_interval = keyframe_interval
+        self._mowers = 0
+        self._keyframe: State = (Coordinates(0, 0), Heading.NORTH)
+        self._codes: List[int] = []
+        self._mower_blocks = 0
+        self._stream.write(_HEADER.pack(MAGIC, VERSION, keyframe_interval))
+
+    def begin(self, location: Coordinates, heading: Heading) -> int:
+        """Start the trajectory of a new Mower.
+
+        Args:
+            location: The initial location of the Mower.
+            heading: The initial heading of the Mower.
+
+        Returns:
+            The index of the Mower in the trace.
+        """
+        self._keyframe = (location, heading)
+        self._codes = []
+        self._mower_blocks = 0
+        self._mowers += 1
+        return self._mowers - 1
+
+    def record(self, movement: Movement, location: Coordinates, heading: Heading):
+        """Record a movement of the current Mower.
+
+        Args:
+            movement: The movement performed.
+            location: The location after the movement.
+            heading: The heading after the movement.
+        """
+        self._codes.append(_MOVEMENT_CODES[movement])
+        if len(self._codes) == self._keyframe_interval:
+            self._write_block()
+            self._keyframe = (location, heading)
+
+    def end(self) -> None:
+        """End the trajectory of the current Mower, writing pending movements."""
+        if self._codes or not self._mower_blocks:
+            self._write_block()
+
+    def _write_block(self) -> None:
+        location, heading = self._keyframe
+        codes = self._codes + [0] * (-len(self._codes) % 4)
+        payload = bytes(
+            codes[i] | codes[i + 1] << 2 | codes[i + 2] << 4 | codes[i + 3] << 6
+            for i in range(0, len(codes), 4)
+        )
+        self._stream.write(
+            _KEYFRAME.pack(
+                self._mowers - 1,
+                location.x,
+                location.y,
+                _HEADING_CODES[heading],
+                len(self._codes),
+            )
+            + payload
+        )
+        self._codes = []
+        self._mower_blocks += 1
+
+
+class TrajectoryReader:
+    """Reads the trajectory of the Mowers from a binary trace.
+
+    Only the keyframes are read when opening the trace, the movements are
+    decoded from the closest keyframe when a step is requested.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        """Initialize the reader indexing the keyframes of the trace.
+
+        Args:
+            stream: The seekable binary stream to read from.
+
+        Raises:
+            InvalidTraceError: When the stream is not a valid trace.
+        """
+        self._stream = stream
+        magic, version, self._keyframe_interval = _HEADER.unpack(
+            self._read(_HEADER.size)
+        )
+        if magic != MAGIC or version != VERSION:
+            raise InvalidTraceError("Not a trajectory trace")
+
+        self._index: Dict[int, List[Tuple[int, State, int]]] = {}
+        while True:
+            keyframe = stream.read(_KEYFRAME.size)
+            if not keyframe:
+                break
+            if len(keyframe) != _KEYFRAME.size:
+                raise InvalidTraceError("Truncated trace")
+            mower, x, y, heading, steps = _KEYFRAME.unpack(keyframe)
+            self._index.setdefault(mower, []).append(
+                (stream.tell(), (Coordinates(x, y), _HEADINGS[heading]), steps)
+            )
+            stream.seek(_payload_size(steps), 1)
+
+    @property
+    def mowers(self) -> int:
+        """Number of Mowers in the trace."""
+        return len(self._index)
+
+    def steps(self, mower: int) -> int:
+        """Number of movements of a Mower.
+
+        Args:
+            mower: The index of the Mower.
+
+        Returns:
+            The number of movements recorded.
+        """
+        return sum(steps for _, _, steps in self._blocks(mower))
+
+    def state_at(self, mower: int, step: int) -> State:
+        """Get the state of a Mower after a number of movements.
+
+        Args:
+            mower: The index of the Mower.
+            step: The number of movements, 0 is the initial state.
+
+        Returns:
+            The location and heading of the Mower.
+
+        Raises:
+            InvalidTraceError: When the step is not in the trace.
+        """
+        blocks = self._blocks(mower)
+        block = min(max(step, 0) // self._keyframe_interval, len(blocks) - 1)
+        offset, state, steps = blocks[block]
+        remaining = step - block * self._keyframe_interval
+        if not 0 <= remaining <= steps:
+            raise InvalidTraceError(f"Step '{step}' not in trace of Mower {mower}")
+
+        self._stream.seek(offset)
+        for movement in _decode(self._read(_payload_size(steps)), remaining):
+            state = _apply(state, movement)
+        return state
+
+    def trajectory(self, mower: int) -> Iterator[State]:
+        """Iterate over all the states of a Mower.
+
+        Args:
+            mower: The index of the Mower.
+
+        Yields:
+            The initial state and the state after every movement.
+        """
+        blocks = self._blocks(mower)
+        yield blocks[0][1]
+        for offset, state, steps in blocks:
+            self._stream.seek(offset)
+            for movement in _decode(self._read(_payload_size(steps)), steps):
+                state = _apply(state, movement)
+                yield state
+
+    def _blocks(self, mower: int) -> List[Tuple[int, State, int]]:
+        try:
+            return self._index[mower]
+        except KeyError as ex:
+            raise InvalidTraceError(f"Mower {mower} not in trace") from ex
+
+    def _read(self, size: int) -> bytes:
+        data = self._stream.read(size)
+        if len(data) != size:
+            raise InvalidTraceError("Truncated trace")
+        return data
+
+
+def _payload_size(steps: int) -> int:
+    return (steps + 3) // 4
+
+
+def _decode(payload: bytes, steps: int) -> Iterator[Movement]:
+    for step in range(steps):
+        yield _MOVEMENTS[payload[step >> 2] >> ((step & 3) << 1) & 3]
+
+
+def _apply(state: State, movement: Movement) -> State:
+    location, heading = state
+    if movement is not Movement.MOVE_FORWARD:
+        return location, calculate_heading(heading, movement)
+    step_x, step_y = FORWARD_STEPS[heading]
+    return Coordinates(location.x + step_x, location.y + step_y), heading
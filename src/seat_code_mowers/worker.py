@@ -0,0 +1,127 @@
+"""Persistent worker processing missions sent over a Unix socket.
+
+Starting the interpreter and importing the package dominates the time of
+small missions, so a warm worker process can serve them instead. Every
+message is a 4 bytes big-endian length followed by the UTF-8 payload. The
+worker answers with a status byte (``0`` for success, ``1`` for errors)
+followed by a message with the output or ``ErrorName: message``.
+"""
+import os
+import socket
+import socketserver
+import struct
+
+from . import exceptions
+from .input_processor import process_input
+
+
+_LENGTH = struct.Struct(">I")
+_STATUS_OK = 0
+_STATUS_ERROR = 1
+
+
+def _send_message(sock: socket.socket, payload: bytes) -> None:
+    sock.sendall(_LENGTH.pack(len(payload)) + payload)
+
+
+def _receive_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError("Connection closed by the worker")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _receive_message(sock: socket.socket) -> bytes:
+    (size,) = _LENGTH.unpack(_receive_exactly(sock, _LENGTH.size))
+    return _receive_exactly(sock, size)
+
+
+class _MissionHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        try:
+            mission = _receive_message(self.request).decode()
+        except ConnectionError:
+            return  # Probe of a new worker checking the socket is alive.
+
+        try:
+            output = process_input(mission)
+        except Exception as ex:  # noqa: B902 - the client gets every error.
+            status = _STATUS_ERROR
+            output = f"{type(ex).__name__}: {ex}"
+        else:
+            status = _STATUS_OK
+
+        self.request.sendall(bytes([status]))
+        _send_message(self.request, output.encode())
+
+
+def create_server(socket_path: str) -> socketserver.UnixStreamServer:
+    """Create a worker bound to a Unix socket.
+
+    A stale socket left by a worker that stopped is removed before binding.
+
+    Args:
+        socket_path: The path of the Unix socket.
+
+    Returns:
+        The server, call ``serve_forever`` to start processing missions.
+    """
+    _remove_stale_socket(socket_path)
+    return socketserver.ThreadingUnixStreamServer(socket_path, _MissionHandler)
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except ConnectionRefusedError:
+            os.unlink(socket_path)
+        except FileNotFoundError:
+            pass
+
+
+def serve(socket_path: str) -> None:
+    """Process missions sent to a Unix socket until interrupted.
+
+    Args:
+        socket_path: The path of the Unix socket.
+    """
+    with create_server(socket_path) as server:
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(socket_path)
+
+
+def submit(socket_path: str, mission: str) -> str:
+    """Send a mission to a worker and wait for its output.
+
+    Args:
+        socket_path: The path of the Unix socket of the worker.
+        mission: The mission input.
+
+    Returns:
+        The output of the mission.
+
+    Raises:
+        MowerBaseError: The error raised by the worker processing the mission,
+            errors from outside the package keep their name in the message.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        _send_message(sock, mission.encode())
+        status = _receive_exactly(sock, 1)[0]
+        output = _receive_message(sock).decode()
+
+    if status == _STATUS_OK:
+        return output
+
+    error_name, _, message = output.partition(": ")
+    error = getattr(exceptions, error_name, None)
+    if error is None:
+        raise exceptions.MowerBaseError(output)
+    raise error(message)
@@ -0,0 +1,131 @@
+"""Tests for the batch runner of missions."""
+import pytest
+from src.seat_code_mowers.batch import find_missions
+from src.seat_code_mowers.batch import MissionBatchRunner
+from src.seat_code_mowers.domain import Movement
+from src.seat_code_mowers.exceptions import InvalidInputError
+from src.seat_code_mowers.exceptions import InvalidMovementError
+from src.seat_code_mowers.service import compile_instructions
+from src.seat_code_mowers.service import Program
+
+
+MISSION = "5 5\n1 2 N\nLMLMLMLMM\n3 3 E\nMMRMMRMRRM\n"
+
+
+def test_it_runs_missions_from_strings():
+    """It yields the output of every mission."""
+    runner = MissionBatchRunner()
+
+    results = list(runner.run([MISSION, "3 3\nO 1 1 1 1\n0 1 E\nRM\n"]))
+
+    assert [result.output for result in results] == ["1 3 N\n5 1 E\n", "0 0 S\n"]
+    assert [result.source for result in results] == ["<string>", "<string>"]
+
+
+def test_it_runs_missions_from_files_and_directories(tmp_path):
+    """It reads the mission files and every file of the directories."""
+    (tmp_path / "first.txt").write_text(MISSION)
+    missions = tmp_path / "missions"
+    missions.mkdir()
+    (missions / "a.txt").write_text("1 1\n0 0 N\nM\n")
+    (missions / "b.txt").write_text("1 1\n0 0 E\nM\n")
+
+    results = list(MissionBatchRunner().run([tmp_path / "first.txt", missions]))
+
+    assert [result.output for result in results] == [
+        "1 3 N\n5 1 E\n",
+        "0 1 N\n",
+        "1 0 E\n",
+    ]
+    assert results[2].source == str(missions / "b.txt")
+
+
+def test_it_runs_the_missions_matching_a_glob(tmp_path):
+    """It runs the files matching a pattern given as a path, sorted."""
+    (tmp_path / "b.txt").write_text("1 1\n0 0 E\nM\n")
+    (tmp_path / "a.txt").write_text(MISSION)
+    (tmp_path / "c.log").write_text("")
+
+    results = list(MissionBatchRunner().run([tmp_path / "*.txt"]))
+
+    assert [result.source for result in results] == [
+        str(tmp_path / "a.txt"),
+        str(tmp_path / "b.txt"),
+    ]
+    assert [result.output for result in results] == ["1 3 N\n5 1 E\n", "1 0 E\n"]
+
+
+def test_it_finds_missions_with_a_glob(tmp_path):
+    """It finds the files matching a pattern, sorted."""
+    (tmp_path / "b.txt").write_text(MISSION)
+    (tmp_path / "a.txt").write_text(MISSION)
+    (tmp_path / "c.log").write_text("")
+
+    assert find_missions(str(tmp_path / "*.txt")) == [
+        tmp_path / "a.txt",
+        tmp_path / "b.txt",
+    ]
+
+
+@pytest.mark.parametrize(
+    "mission, error",
+    [
+        ("", InvalidInputError),
+        ("5 5\n1 2 3\nM\n", InvalidInputError),
+        ("5 5\n1 2 N\n", InvalidInputError),
+        ("1 1\n0 0 S\nM\n", InvalidMovementError),
+        ("1 1\n0 0 N\nMX\n", ValueError),
+    ],
+)
+def test_a_failed_mission_does_not_stop_the_batch(mission, error):
+    """It keeps the error in the result and runs the next missions."""
+    results = list(MissionBatchRunner().run([mission, MISSION]))
+
+    assert isinstance(results[0].error, error)
+    assert results[0].output is None
+    assert results[1].output == "1 3 N\n5 1 E\n"
+
+
+def test_a_bug_stops_the_batch(monkeypatch):
+    """It doesn't keep the errors that aren't caused by the mission."""
+    runner = MissionBatchRunner()
+    monkeypatch.setattr(runner, "_compile", lambda instructions: None)
+
+    with pytest.raises(AttributeError):
+        runner.run_mission(MISSION)
+
+
+def test_it_has_no_throughput_before_running():
+    """It reports no throughput when no time was spent."""
+    runner = MissionBatchRunner()
+
+    assert runner.stats.missions_per_second == 0.0
+    assert runner.stats.instructions_per_second == 0.0
+
+
+def test_it_aggregates_the_throughput():
+    """It counts the missions, Mowers and instructions run."""
+    runner = MissionBatchRunner()
+
+    for _ in runner.run([MISSION, MISSION, ""]):
+        pass
+
+    assert runner.stats.missions == 3
+    assert runner.stats.failed == 1
+    assert runner.stats.mowers == 4
+    assert runner.stats.instructions == 4 * 19 // 2
+    assert runner.stats.missions_per_second > 0
+
+
+@pytest.mark.parametrize(
+    "instructions, runs, invalid",
+    [
+        ("", (), None),
+        ("MMLLLLM", ((Movement.MOVE_FORWARD, 3),), None),
+        ("LRRRLM", ((Movement.RIGHT_90_DEGREES, 1), (Movement.MOVE_FORWARD, 1)), None),
+        ("MLLLX", ((Movement.MOVE_FORWARD, 1), (Movement.RIGHT_90_DEGREES, 1)), "X"),
+    ],
+)
+def test_it_compiles_instructions_to_runs(instructions, runs, invalid):
+    """It merges the forward runs and reduces the rotations to their net turn."""
+    assert compile_instructions(instructions) == Program(runs, invalid)
@@ -0,0 +1,88 @@
+"""Tests for the coverage module."""
+import uuid
+
+import pytest
+from src.seat_code_mowers.coverage import CoverageRecorder
+from src.seat_code_mowers.domain import Coordinates
+from src.seat_code_mowers.domain import Heading
+from src.seat_code_mowers.domain import Movement
+from src.seat_code_mowers.domain import Mower
+from src.seat_code_mowers.domain import Plateau
+
+
+def test_a_new_recorder_has_no_coverage():
+    """It starts with no covered cells."""
+    recorder = CoverageRecorder(5, 5)
+
+    assert recorder.covered_cells == 0
+    assert recorder.visits == 0
+    assert recorder.percentage == 0.0
+
+
+def test_marked_cells_are_covered_and_revisits_count_as_overlap():
+    """It counts unique cells and revisits."""
+    recorder = CoverageRecorder(1, 1)
+
+    recorder.mark(Coordinates(0, 0))
+    recorder.mark(Coordinates(0, 1))
+    recorder.mark(Coordinates(0, 0))
+
+    assert recorder.is_covered(Coordinates(0, 0))
+    assert not recorder.is_covered(Coordinates(1, 1))
+    assert recorder.covered_cells == 2
+    assert recorder.overlap == 1
+    assert recorder.percentage == 50.0
+
+
+def test_cells_in_different_tiles_are_covered():
+    """It records cells far away in big plateaus."""
+    recorder = CoverageRecorder(9999, 9999)
+
+    recorder.mark(Coordinates(9999, 9999))
+    recorder.mark(Coordinates(64, 0))
+
+    assert recorder.is_covered(Coordinates(9999, 9999))
+    assert recorder.is_covered(Coordinates(64, 0))
+    assert not recorder.is_covered(Coordinates(0, 0))
+    assert recorder.covered_cells == 2
+
+
+def test_a_mower_marks_the_cells_it_moves_through():
+    """It records the start cell and every forward movement."""
+    recorder = CoverageRecorder(5, 5)
+    mower = Mower(
+        uuid.uuid4(), Coordinates(1, 2), Heading.NORTH, Plateau(5, 5), recorder
+    )
+
+    for instruction in "LMLMLMLMM":
+        mower.move(Movement(instruction))
+
+    assert recorder.visits == 6
+    assert recorder.covered_cells == 5
+    assert recorder.is_covered(Coordinates(1, 3))
+
+
+def test_merge_returns_the_union_of_the_coverage():
+    """It merges the coverage of several recorders."""
+    first = CoverageRecorder(1, 1)
+    first.mark(Coordinates(0, 0))
+    first.mark(Coordinates(1, 0))
+    second = CoverageRecorder(1, 1)
+    second.mark(Coordinates(1, 0))
+    second.mark(Coordinates(1, 1))
+
+    merged = CoverageRecorder.merge([first, second])
+
+    assert merged.covered_cells == 3
+    assert merged.overlap == 1
+    assert merged.percentage == 75.0
+
+
+@pytest.mark.parametrize(
+    "recorders",
+    [[], [CoverageRecorder(1, 1), CoverageRecorder(2, 2)]],
+)
+def test_merge_of_invalid_recorders_raises_an_error(recorders):
+    """It raises an error when there's nothing to merge or sizes differ."""
+    with pytest.raises(ValueError):
+        CoverageRecorder.merge(recorders)
@@ -0,0 +1,341 @@
+"""Differential tests of the execution engines against the reference path.
+
+Every generated case runs through the reference ``Mower.move`` path and
+through every engine, which must produce the same status lines and raise the
+same errors. The time of every engine relative to the reference is kept per
+case shape in the pytest cache under ``differential/speedups``.
+"""
+import io
+import time
+import uuid
+from collections import defaultdict
+from contextlib import suppress
+from itertools import groupby
+
+import pytest
+from hypothesis import given
+from hypothesis import HealthCheck
+from hypothesis import settings
+from hypothesis import strategies as st
+from src.seat_code_mowers.batch import MissionBatchRunner
+from src.seat_code_mowers.domain import Coordinates
+from src.seat_code_mowers.domain import Heading
+from src.seat_code_mowers.domain import Movement
+from src.seat_code_mowers.domain import Mower
+from src.seat_code_mowers.domain import Plateau
+from src.seat_code_mowers.exceptions import InvalidMovementError
+from src.seat_code_mowers.fleet import FleetState
+from src.seat_code_mowers.input_processor import process_input
+from src.seat_code_mowers.obstacles import ObstacleMap
+from src.seat_code_mowers.output import BytearraySink
+from src.seat_code_mowers.service import MowerService
+
+
+EXAMPLES = settings(
+    max_examples=200,
+    deadline=None,
+    suppress_health_check=[HealthCheck.too_slow],
+)
+
+_timings = defaultdict(list)
+
+
+def _run(engine, *args):
+    try:
+        return engine(*args), None
+    except Exception as ex:  # noqa: B902
+        return None, (type(ex).__name__, str(ex))
+
+
+def _status(mower):
+    return f"{mower.location.x} {mower.location.y} {mower.heading.value}"
+
+
+def _render(plateau, obstacles, mowers):
+    lines = [f"{plateau[0]} {plateau[1]}"]
+    lines += ["O " + " ".join(map(str, rectangle)) for rectangle in obstacles]
+    for x, y, heading, instructions in mowers:
+        lines += [f"{x} {y} {heading}", instructions]
+    return "\n".join(lines) + "\n"
+
+
+def _plateau(plateau, obstacles, thread_safe=False):
+    obstacle_map = ObstacleMap(obstacles) if obstacles else None
+    return Plateau(*plateau, thread_safe=thread_safe, obstacles=obstacle_map)
+
+
+# Missions: every Mower has its own plateau, as in process_input.
+
+
+def reference_mission(plateau, obstacles, mowers):
+    """Run the Mowers one by one through Mower.move."""
+    statuses = []
+    for x, y, heading, instructions in mowers:
+        mower = Mower(
+            uuid.uuid4(),
+            Coordinates(x, y),
+            Heading(heading),
+            _plateau(plateau, obstacles),
+        )
+        for instruction in instructions:
+            mower.move(Movement(instruction))
+        statuses.append(_status(mower))
+    return statuses
+
+
+def _service_mission(mower_service, plateau, obstacles, mowers, **options):
+    obstacle_map = ObstacleMap(obstacles) if obstacles else None
+    statuses = []
+    for x, y, heading, instructions in mowers:
+        mower_id = mower_service.create_mower(
+            heading, (x, y), plateau, obstacles=obstacle_map, **options
+        )
+        mower_service.send_instructions(mower_id, instructions)
+        statuses.append(mower_service.get_mower_status(mower_id))
+    return statuses
+
+
+def _service_fork_mission(plateau, obstacles, mowers):
+    mower_service = MowerService()
+    obstacle_map = ObstacleMap(obstacles) if obstacles else None
+    mower_ids = [
+        mower_service.create_mower(heading, (x, y), plateau, obstacles=obstacle_map)
+        for x, y, heading, _ in mowers
+    ]
+    fork = mower_service.fork().fork()
+    statuses = []
+    for mower_id, (_, _, _, instructions) in zip(mower_ids, mowers):
+        fork.send_instructions(mower_id, instructions)
+        statuses.append(fork.get_mower_status(mower_id))
+    return statuses
+
+
+MISSION_ENGINES = {
+    "process_input": lambda *case: process_input(_render(*case)).splitlines(),
+    "bytearray_sink": lambda *case: _bytearray_mission(_render(*case)),
+    "batch_runner": lambda *case: _batch_mission(_render(*case)),
+    "trace": lambda *case: process_input(_render(*case), io.BytesIO()).splitlines(),
+    "thread_safe_service": lambda *case: _service_mission(
+        MowerService(thread_safe=True), *case
+    ),
+    "coverage": lambda *case: _service_mission(
+        MowerService(), *case, record_coverage=True
+    ),
+    "service_fork": lambda *case: _service_fork_mission(*case),
+}
+
+
+def reference_text(text):
+    """Run a mission text through process_input."""
+    return process_input(text).splitlines()
+
+
+TEXT_ENGINES = {
+    "bytearray_sink": lambda text: _bytearray_mission(text),
+    "batch_runner": lambda text: _batch_mission(text),
+    "trace": lambda text: process_input(text, io.BytesIO()).splitlines(),
+}
+
+
+def _bytearray_mission(text):
+    sink = BytearraySink()
+    process_input(text, output=sink)
+    return sink.getvalue().decode().splitlines()
+
+
+# A single runner for all the cases, so its caches are warm.
+_batch_runner = MissionBatchRunner()
+
+
+def _batch_mission(text):
+    result = _batch_runner.run_mission(text)
+    if result.error is not None:
+        raise result.error
+    return result.output.splitlines()
+
+
+# Fleets: all the Mowers share a plateau, so they can collide.
+
+
+def _single_movements(mower, instructions):
+    for instruction in instructions:
+        mower.move(Movement(instruction))
+
+
+def _forward_runs(mower, instructions):
+    for instruction, group in groupby(instructions):
+        steps = sum(1 for _ in group)
+        if instruction == Movement.MOVE_FORWARD.value:
+            mower.move_forward(steps)
+        else:
+            for _ in range(steps):
+                mower.move(Movement(instruction))
+
+
+def _fleet(plateau, obstacles, mowers, follow=_single_movements, thread_safe=False):
+    shared = _plateau(plateau, obstacles, thread_safe)
+    fleet = [
+        (Mower(uuid.uuid4(), Coordinates(x, y), Heading(heading), shared), program)
+        for x, y, heading, program in mowers
+    ]
+    statuses = []
+    for mower, instructions in fleet:
+        follow(mower, instructions)
+        statuses.append(_status(mower))
+    return statuses
+
+
+def reference_fleet(plateau, obstacles, mowers):
+    """Run the Mowers one by one through Mower.move in a shared plateau."""
+    return _fleet(plateau, obstacles, mowers)
+
+
+def _fleet_state(plateau, obstacles, mowers, fork=False):
+    fleet = FleetState(*plateau, ObstacleMap(obstacles) if obstacles else None)
+    for x, y, heading, _ in mowers:
+        fleet.add_mower(Coordinates(x, y), Heading(heading))
+    if fork:
+        # Moving the base must not move its fork.
+        base, fleet = fleet, fleet.fork()
+        with suppress(InvalidMovementError):
+            base.send_instructions(0, "MRM")
+    statuses = []
+    for index, (*_, instructions) in enumerate(mowers):
+        fleet.send_instructions(index, instructions)
+        location = fleet.location(index)
+        statuses.append(f"{location.x} {location.y} {fleet.heading(index).value}")
+    return statuses
+
+
+FLEET_ENGINES = {
+    "thread_safe_plateau": lambda *case: _fleet(*case, thread_safe=True),
+    "forward_runs": lambda *case: _fleet(*case, follow=_forward_runs),
+    "fleet_state": lambda *case: _fleet_state(*case),
+    "fleet_state_fork": lambda *case: _fleet_state(*case, fork=True),
+}
+
+
+# Strategies.
+
+headings = st.sampled_from([heading.value for heading in Heading])
+instructions = st.text(alphabet="LRM", min_size=1, max_size=60)
+forward_heavy_instructions = st.text(alphabet="LRMMMMM", min_size=1, max_size=60)
+
+
+@st.composite
+def plateaus(draw):
+    """Small plateaus, including single rows and columns, and big ones."""
+    big = draw(st.booleans())
+    upper = 5000 if big else 12
+    return draw(st.integers(0, upper)), draw(st.integers(0, upper))
+
+
+@st.composite
+def obstacles_of(draw, plateau):
+    """Up to 3 rectangles inside a plateau."""
+    corners_x = st.integers(0, plateau[0])
+    corners_y = st.integers(0, plateau[1])
+    return draw(
+        st.lists(st.tuples(corners_x, corners_y, corners_x, corners_y), max_size=3)
+    )
+
+
+@st.composite
+def missions(draw):
+    """A plateau with obstacles and Mowers placed anywhere or hugging its edges."""
+    plateau = draw(plateaus())
+    edge = draw(st.booleans())
+    mowers = []
+    for _ in range(draw(st.integers(1, 6))):
+        if edge:
+            x = draw(st.sampled_from([0, plateau[0]]))
+            y = draw(st.sampled_from([0, plateau[1]]))
+        else:
+            x = draw(st.integers(0, plateau[0]))
+            y = draw(st.integers(0, plateau[1]))
+        mowers.append((x, y, draw(headings), draw(forward_heavy_instructions)))
+    return plateau, draw(obstacles_of(plateau)), mowers
+
+
+@st.composite
+def crowded_fleets(draw):
+    """A small plateau with obstacles packed with Mowers."""
+    plateau = (draw(st.integers(0, 5)), draw(st.integers(0, 5)))
+    cells = [(x, y) for x in range(plateau[0] + 1) for y in range(plateau[1] + 1)]
+    starts = draw(
+        st.lists(st.sampled_from(cells), min_size=1, max_size=len(cells), unique=True)
+    )
+    mowers = [(x, y, draw(headings), draw(instructions)) for x, y in starts]
+    return plateau, draw(obstacles_of(plateau)), mowers
+
+
+@st.composite
+def mission_texts(draw):
+    """Valid missions with random corruptions."""
+    text = _render(*draw(missions()))
+    position = draw(st.integers(0, len(text)))
+    junk = draw(st.text(alphabet="0123456789 -NESWLRMOPX\n", max_size=4))
+    return text[:position] + junk + text[position + len(junk) :]
+
+
+def _shape(plateau, obstacles, mowers, kind):
+    size = "big" if max(plateau) > 12 else "small"
+    size += "+obstacles" if obstacles else ""
+    mowers_bucket = "1" if len(mowers) == 1 else "few" if len(mowers) < 10 else "many"
+    length = max(len(mower[3]) for mower in mowers)
+    return f"{kind}/{size}/{mowers_bucket}/{'long' if length > 30 else 'short'}"
+
+
+def _timed_run(engine, shape, name, *args):
+    start = time.perf_counter()
+    result = _run(engine, *args)
+    _timings[(shape, name)].append(time.perf_counter() - start)
+    return result
+
+
+def _assert_engines_agree(reference, engines, shape, *args):
+    expected = _timed_run(reference, shape, "reference", *args)
+    for name, engine in engines.items():
+        assert _timed_run(engine, shape, name, *args) == expected, name
+
+
+@pytest.fixture(scope="module", autouse=True)
+def performance_log(request):
+    """Store the speedup of every engine per case shape in the pytest cache."""
+    yield
+    cache = getattr(request.config, "cache", None)
+    if cache is None:  # The cache provider plugin is disabled.
+        return
+
+    totals = {key: sum(times) for key, times in _timings.items()}
+    speedups = defaultdict(dict)
+    for (shape, name), total in totals.items():
+        reference = totals.get((shape, "reference"))
+        if name != "reference" and reference and total:
+            speedups[shape][name] = round(reference / total, 3)
+    cache.set("differential/speedups", speedups)
+
+
+@EXAMPLES
+@given(missions())
+def test_mission_engines_agree_with_the_reference(mission):
+    """It produces the same statuses and errors in every mission engine."""
+    _assert_engines_agree(
+        reference_mission, MISSION_ENGINES, _shape(*mission, "mission"), *mission
+    )
+
+
+@EXAMPLES
+@given(crowded_fleets())
+def test_fleet_engines_agree_with_the_reference(fleet):
+    """It produces the same statuses and collisions in every fleet engine."""
+    _assert_engines_agree(
+        reference_fleet, FLEET_ENGINES, _shape(*fleet, "fleet"), *fleet
+    )
+
+
+@EXAMPLES
+@given(mission_texts())
+def test_text_engines_agree_on_corrupted_input(text):
+    """It produces the same output or errors for corrupted inputs."""
+    _assert_engines_agree(reference_text, TEXT_ENGINES, "text", text)
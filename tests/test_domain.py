@@ -1,4 +1,7 @@
 """Tests for the domain module."""
+import random
+import sys
+import threading
 import uuid
 
 import pytest
@@ -203,3 +206,43 @@ def test_a_mower_cannot_be_moved_to_a_occupied_position():
         mower.move(Movement.MOVE_FORWARD)
 
     assert exim.value.args[0] == "'Coordinates(x=2, y=3)' already occupied"
+
+
+@pytest.fixture
+def frequent_thread_switches():
+    """Make threads switch as often as possible to surface races."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+@pytest.mark.usefixtures("frequent_thread_switches")
+def test_mowers_in_a_thread_safe_plateau_can_move_from_several_threads():
+    """It never loses a Mower nor puts two Mowers in the same cell."""
+    plateau = Plateau(upper_right_x=5, upper_right_y=5, thread_safe=True)
+    mowers = [
+        Mower(uuid.uuid4(), Coordinates(x, y), Heading.NORTH, plateau)
+        for x in range(0, 6, 2)
+        for y in range(0, 6, 2)
+    ]
+
+    def drive(mower, seed):
+        instructions = random.Random(seed).choices("LRMMM", k=2000)
+        for instruction in instructions:
+            try:
+                mower.move(Movement(instruction))
+            except InvalidMovementError:
+                pass
+
+    threads = [
+        threading.Thread(target=drive, args=(mower, seed))
+        for seed, mower in enumerate(mowers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({mower.location for mower in mowers}) == len(mowers)
+    assert plateau._coordinates == {mower.location: mower for mower in mowers}
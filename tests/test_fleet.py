@@ -0,0 +1,288 @@
+"""Tests for the fleet states with copy-on-write forks."""
+import threading
+import uuid
+
+import pytest
+from src.seat_code_mowers.domain import Coordinates
+from src.seat_code_mowers.domain import Heading
+from src.seat_code_mowers.domain import Mower
+from src.seat_code_mowers.domain import Plateau
+from src.seat_code_mowers.exceptions import InvalidMovementError
+from src.seat_code_mowers.exceptions import MowerNotFoundError
+from src.seat_code_mowers.fleet import FleetState
+from src.seat_code_mowers.fleet import PAGE_SIZE
+from src.seat_code_mowers.obstacles import ObstacleMap
+from src.seat_code_mowers.output import ListSink
+from src.seat_code_mowers.service import MowerService
+
+
+def _fleet(size):
+    fleet = FleetState(size - 1, size - 1)
+    for index in range(size):
+        fleet.add_mower(Coordinates(index, 0), Heading.NORTH)
+    return fleet
+
+
+def test_it_moves_the_mowers():
+    """It follows the instructions as the Mowers of a plateau."""
+    fleet = FleetState(5, 5)
+    first = fleet.add_mower(Coordinates(1, 2), Heading.NORTH)
+    second = fleet.add_mower(Coordinates(3, 3), Heading.EAST)
+
+    fleet.send_instructions(first, "LMLMLMLMM")
+    fleet.send_instructions(second, "MMRMMRMRRM")
+
+    assert (fleet.location(first), fleet.heading(first)) == (
+        Coordinates(1, 3),
+        Heading.NORTH,
+    )
+    assert (fleet.location(second), fleet.heading(second)) == (
+        Coordinates(5, 1),
+        Heading.EAST,
+    )
+
+
+@pytest.mark.parametrize(
+    "instructions, message, location",
+    [
+        ("MMMM", "'Coordinates(x=0, y=4)' out of plateau", Coordinates(0, 3)),
+        ("RM", "'Coordinates(x=1, y=0)' already occupied", Coordinates(0, 0)),
+        ("MRM", "'Coordinates(x=1, y=1)' blocked by an obstacle", Coordinates(0, 1)),
+    ],
+)
+def test_it_raises_the_errors_of_the_plateau(instructions, message, location):
+    """It stops the Mower in the last valid cell, with the plateau errors."""
+    fleet = FleetState(3, 3, ObstacleMap([(1, 1, 2, 2)]))
+    fleet.add_mower(Coordinates(0, 0), Heading.NORTH)
+    fleet.add_mower(Coordinates(1, 0), Heading.NORTH)
+
+    with pytest.raises(InvalidMovementError) as error:
+        fleet.send_instructions(0, instructions)
+
+    assert str(error.value) == message
+
+    assert fleet.location(0) == location
+
+
+def test_it_raises_an_exception_for_unknown_mowers():
+    """It raises an exception for indexes out of the fleet."""
+    with pytest.raises(MowerNotFoundError):
+        _fleet(2).send_instructions(2, "M")
+
+
+def test_it_raises_an_exception_for_invalid_instructions():
+    """It raises the ValueError of the instruction after the valid ones."""
+    fleet = FleetState(5, 5)
+    index = fleet.add_mower(Coordinates(0, 0), Heading.NORTH)
+
+    with pytest.raises(ValueError, match="'X' is not a valid Movement"):
+        fleet.send_instructions(index, "MX")
+
+    assert fleet.location(index) == Coordinates(0, 1)
+
+
+def test_a_fork_does_not_change_its_base():
+    """It moves the Mowers of a fork without moving the base ones."""
+    base = _fleet(3)
+    fork = base.fork()
+
+    fork.send_instructions(0, "MMRM")
+    base.send_instructions(1, "M")
+
+    assert [fork.location(i) for i in range(3)] == [
+        Coordinates(1, 2),
+        Coordinates(1, 0),
+        Coordinates(2, 0),
+    ]
+    assert [base.location(i) for i in range(3)] == [
+        Coordinates(0, 0),
+        Coordinates(1, 1),
+        Coordinates(2, 0),
+    ]
+
+
+def test_a_fork_sees_its_own_occupancy():
+    """It frees the cells left in a fork only, for collisions."""
+    base = _fleet(2)
+    fork = base.fork()
+    fork.send_instructions(1, "M")
+
+    base.send_instructions(0, "R")
+    fork.send_instructions(0, "RM")
+
+    with pytest.raises(InvalidMovementError):
+        base.send_instructions(0, "M")
+    assert fork.location(0) == Coordinates(1, 0)
+
+
+def test_a_fork_duplicates_only_the_pages_it_writes():
+    """It shares the pages of the Mowers it doesn't move."""
+    base = _fleet(3 * PAGE_SIZE)
+    fork = base.fork()
+
+    fork.send_instructions(PAGE_SIZE, "M")
+
+    assert fork._pages.pages[0] is base._pages.pages[0]
+    assert fork._pages.pages[1] is not base._pages.pages[1]
+    assert fork._pages.pages[2] is base._pages.pages[2]
+
+
+def test_forks_can_run_in_parallel():
+    """It runs speculative forks of one base from several threads."""
+    base = _fleet(64)
+    forks = [base.fork() for _ in range(8)]
+
+    def run(fork, steps):
+        for index in range(64):
+            fork.send_instructions(index, "M" * steps)
+
+    threads = [
+        threading.Thread(target=run, args=(fork, steps))
+        for steps, fork in enumerate(forks)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for steps, fork in enumerate(forks):
+        assert fork.location(63) == Coordinates(63, steps)
+    assert base.location(63) == Coordinates(63, 0)
+
+
+def test_it_is_built_from_the_mowers_of_a_plateau():
+    """It copies the locations and headings of Mowers sharing a plateau."""
+    plateau = Plateau(5, 5)
+    mowers = [
+        Mower(uuid.uuid4(), Coordinates(1, 2), Heading.NORTH, plateau),
+        Mower(uuid.uuid4(), Coordinates(3, 3), Heading.EAST, plateau),
+    ]
+
+    fleet = FleetState.from_mowers(mowers)
+
+    assert len(fleet) == 2
+    assert fleet.location(1) == Coordinates(3, 3)
+    assert fleet.heading(1) == Heading.EAST
+    with pytest.raises(ValueError):
+        FleetState.from_mowers(
+            [Mower(uuid.uuid4(), Coordinates(0, 0), Heading.NORTH, Plateau(5, 5))]
+            + mowers
+        )
+    with pytest.raises(ValueError):
+        FleetState.from_mowers([])
+
+
+def test_a_service_can_be_forked():
+    """It drives the Mowers of a fork by id without moving the service ones."""
+    mower_service = MowerService()
+    first = mower_service.create_mower("N", (1, 2), (5, 5))
+    second = mower_service.create_mower("E", (3, 3), (5, 5))
+
+    fork = mower_service.fork()
+    fork.send_instructions(first, "LMLMLMLMM")
+    fork.send_instructions(second, "MMRMMRMRRM")
+
+    assert fork.get_mower_status(first) == "1 3 N"
+    assert fork.get_mower_status(second) == "5 1 E"
+    assert mower_service.get_mower_status(first) == "1 2 N"
+    assert mower_service.get_mower_status(second) == "3 3 E"
+
+
+def test_the_forks_of_a_service_fork_are_independent():
+    """It branches forks of a fork, writing the status of their Mowers."""
+    mower_service = MowerService()
+    mower_id = mower_service.create_mower("N", (0, 0), (3, 3))
+    base = mower_service.fork()
+    fork = base.fork()
+
+    fork.send_instructions(mower_id, "MM")
+    base.send_instructions(mower_id, "RM")
+
+    sink = ListSink()
+    fork.write_mower_status(mower_id, sink)
+    base.write_mower_status(mower_id, sink)
+    assert sink.getvalue() == "0 2 N\n1 0 E\n"
+
+
+def test_the_mowers_of_a_service_fork_do_not_collide():
+    """It moves every Mower on its own plateau, as in the service."""
+    mower_service = MowerService()
+    first = mower_service.create_mower("N", (0, 0), (3, 3))
+    second = mower_service.create_mower("N", (0, 1), (3, 3))
+    fork = mower_service.fork()
+
+    fork.send_instructions(first, "M")
+    fork.send_instructions(second, "MM")
+
+    assert fork.get_mower_status(first) == "0 1 N"
+    assert fork.get_mower_status(second) == "0 3 N"
+    assert len(fork) == 2
+    assert len(fork._plateaus) == 1
+
+
+def test_a_service_fork_raises_the_errors_of_the_plateau():
+    """It stops the Mower before the obstacles and edges of its plateau."""
+    mower_service = MowerService()
+    obstacles = ObstacleMap([(1, 2, 1, 2)])
+    mower_id = mower_service.create_mower("N", (1, 0), (3, 3), obstacles=obstacles)
+    fork = mower_service.fork()
+
+    with pytest.raises(InvalidMovementError) as error:
+        fork.send_instructions(mower_id, "MMM")
+
+    assert str(error.value) == "'Coordinates(x=1, y=2)' blocked by an obstacle"
+    assert fork.get_mower_status(mower_id) == "1 1 N"
+
+
+def test_a_service_fork_moves_the_mowers_out_of_the_free_cells():
+    """It moves a Mower off the obstacle it starts on, as in the service."""
+    mower_service = MowerService()
+    obstacles = ObstacleMap([(1, 1, 1, 1)])
+    blocked = mower_service.create_mower("N", (1, 1), (3, 3), obstacles=obstacles)
+    outside = mower_service.create_mower("N", (5, 5), (3, 3))
+    fork = mower_service.fork()
+
+    fork.send_instructions(blocked, "M")
+    with pytest.raises(InvalidMovementError) as error:
+        fork.send_instructions(outside, "M")
+
+    assert fork.get_mower_status(blocked) == "1 2 N"
+    assert str(error.value) == "'Coordinates(x=5, y=6)' out of plateau"
+    assert fork.get_mower_status(outside) == "5 5 N"
+
+
+def test_the_forks_of_a_service_share_their_pages():
+    """It duplicates only the pages of the Mowers a fork moves."""
+    mower_service = MowerService()
+    mower_ids = [
+        mower_service.create_mower("N", (0, 0), (5, 5)) for _ in range(3 * PAGE_SIZE)
+    ]
+    base = mower_service.fork()
+    fork = base.fork()
+
+    fork.send_instructions(mower_ids[PAGE_SIZE], "M")
+
+    assert fork._indexes is base._indexes
+    assert fork._pages.pages[0] is base._pages.pages[0]
+    assert fork._pages.pages[1] is not base._pages.pages[1]
+    assert fork._pages.pages[2] is base._pages.pages[2]
+    assert base.get_mower_status(mower_ids[PAGE_SIZE]) == "0 0 N"
+
+
+def test_a_service_fork_raises_an_exception_for_invalid_instructions():
+    """It raises the ValueError of the instruction after the valid ones."""
+    mower_service = MowerService()
+    mower_id = mower_service.create_mower("N", (0, 0), (5, 5))
+    fork = mower_service.fork()
+
+    with pytest.raises(ValueError):
+        fork.send_instructions(mower_id, "MX")
+
+    assert fork.get_mower_status(mower_id) == "0 1 N"
+
+
+@pytest.mark.parametrize("mower_id", ["1234", str(uuid.uuid4())])
+def test_a_service_fork_raises_an_exception_for_unknown_mowers(mower_id):
+    """It raises the errors of the service for unknown ids."""
+    with pytest.raises(MowerNotFoundError):
+        MowerService().fork().send_instructions(mower_id, "M")
@@ -2,6 +2,7 @@
 import pytest
 from src.seat_code_mowers.exceptions import InvalidInputError
 from src.seat_code_mowers.input_processor import process_input
+from src.seat_code_mowers.output import BytearraySink
 
 
 @pytest.mark.parametrize(
@@ -21,9 +22,25 @@ def test_it_can_read_a_valid_input(mowers_input, expected_output):
 
 @pytest.mark.parametrize(
     "mowers_input",
-    ["", "asdasd", "5 5\n12312", "5 5\n1 2 3\nLMLMLMLMM\n3 3 E\nMMRMMRMRRM\n"],
+    [
+        "",
+        "asdasd",
+        "5 5\n12312",
+        "5 5\n1 2 N\n",
+        "5 5\n1 2 3\nLMLMLMLMM\n3 3 E\nMMRMMRMRRM\n",
+    ],
 )
 def test_when_read_an_invalid_input_it_raises_an_exception(mowers_input):
     """It raises an exception when it cannot process the input."""
     with pytest.raises(InvalidInputError):
         process_input(mowers_input)
+
+
+def test_it_can_write_the_output_to_a_sink():
+    """It writes the status of the Mowers to the sink instead of returning it."""
+    sink = BytearraySink()
+
+    output = process_input("5 5\n1 2 N\nLMLMLMLMM\n3 3 E\nMMRMMRMRRM\n", output=sink)
+
+    assert output is None
+    assert sink.getvalue() == b"1 3 N\n5 1 E\n"
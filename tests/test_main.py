@@ -0,0 +1,77 @@
+"""Test cases for the __main__ module."""
+import pytest
+from click.testing import CliRunner
+from src.seat_code_mowers import __main__
+from src.seat_code_mowers import worker
+
+
+MISSION = "5 5\n1 2 N\nLMLMLMLMM\n3 3 E\nMMRMMRMRRM\n"
+
+
+@pytest.fixture
+def runner() -> CliRunner:
+    """Fixture for invoking command-line interfaces."""
+    return CliRunner()
+
+
+def test_main_processes_the_standard_input(runner: CliRunner) -> None:
+    """It prints the status of the Mowers read from the standard input."""
+    result = runner.invoke(__main__.main, input=MISSION)
+
+    assert result.exit_code == 0
+    assert result.output == "1 3 N\n5 1 E\n"
+
+
+def test_main_processes_mission_files(runner: CliRunner, tmp_path) -> None:
+    """It prints the status of the Mowers of every mission file."""
+    mission_file = tmp_path / "mission.txt"
+    mission_file.write_text(MISSION)
+
+    result = runner.invoke(__main__.main, [str(mission_file), str(mission_file)])
+
+    assert result.exit_code == 0
+    assert result.output == "1 3 N\n5 1 E\n" * 2
+
+
+def test_main_fails_with_an_invalid_mission(runner: CliRunner) -> None:
+    """It exits with an error when the mission cannot be processed."""
+    result = runner.invoke(__main__.main, input="asdasd")
+
+    assert result.exit_code == 1
+    assert "Unprocessable input" in result.output
+
+
+def test_main_fails_with_an_invalid_instruction(runner: CliRunner) -> None:
+    """It exits with the error a worker reports for the same mission."""
+    result = runner.invoke(__main__.main, input="5 5\n1 2 N\nLMXLM\n")
+
+    assert result.exit_code == 1
+    assert result.output == "Error: ValueError: 'X' is not a valid Movement\n"
+
+
+def test_main_serve_requires_a_socket(runner: CliRunner) -> None:
+    """It exits with a usage error when serving without socket."""
+    result = runner.invoke(__main__.main, ["--serve"])
+
+    assert result.exit_code == 2
+
+
+def test_main_serve_runs_a_worker(runner: CliRunner, mocker) -> None:
+    """It serves missions on the given socket."""
+    serve = mocker.patch.object(worker, "serve")
+
+    result = runner.invoke(__main__.main, ["--serve", "--socket", "mowers.sock"])
+
+    assert result.exit_code == 0
+    serve.assert_called_once_with("mowers.sock")
+
+
+def test_main_sends_the_missions_to_a_worker(runner: CliRunner, mocker) -> None:
+    """It prints the output of the worker when a socket is given."""
+    submit = mocker.patch.object(worker, "submit", return_value="1 3 N\n")
+
+    result = runner.invoke(__main__.main, ["--socket", "mowers.sock"], input=MISSION)
+
+    assert result.exit_code == 0
+    assert result.output == "1 3 N\n"
+    submit.assert_called_once_with("mowers.sock", MISSION)
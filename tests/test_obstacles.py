@@ -0,0 +1,160 @@
+"""Tests for the obstacles module."""
+import uuid
+
+import pytest
+from src.seat_code_mowers.domain import Coordinates
+from src.seat_code_mowers.domain import Heading
+from src.seat_code_mowers.domain import Movement
+from src.seat_code_mowers.domain import Mower
+from src.seat_code_mowers.domain import Plateau
+from src.seat_code_mowers.exceptions import InvalidInputError
+from src.seat_code_mowers.exceptions import InvalidMovementError
+from src.seat_code_mowers.input_processor import process_input
+from src.seat_code_mowers.obstacles import ObstacleMap
+
+
+def test_the_cells_of_a_rectangle_are_blocked():
+    """It blocks every cell of a rectangle, corners included."""
+    obstacles = ObstacleMap(rectangles=[(3, 4, 1, 2)])
+
+    assert obstacles.is_blocked(Coordinates(1, 2))
+    assert obstacles.is_blocked(Coordinates(3, 4))
+    assert obstacles.is_blocked(Coordinates(2, 3))
+    assert not obstacles.is_blocked(Coordinates(0, 2))
+    assert not obstacles.is_blocked(Coordinates(2, 5))
+
+
+def test_the_cells_inside_a_polygon_are_blocked():
+    """It blocks the cells inside a triangle."""
+    obstacles = ObstacleMap(polygons=[[(0, 0), (6, 0), (0, 6)]])
+
+    assert obstacles.is_blocked(Coordinates(1, 1))
+    assert obstacles.is_blocked(Coordinates(2, 3))
+    assert not obstacles.is_blocked(Coordinates(4, 4))
+    assert not obstacles.is_blocked(Coordinates(7, 0))
+
+
+@pytest.mark.parametrize(
+    "polygon, rectangle",
+    [
+        ([(0, 0), (2, 0), (2, 2), (0, 2)], (0, 0, 2, 2)),
+        ([(1, 3), (1, 1), (4, 1), (4, 3)], (1, 1, 4, 3)),
+        ([(5, 5), (5, 5), (5, 5)], (5, 5, 5, 5)),
+    ],
+)
+def test_a_polygon_blocks_the_cells_of_the_same_rectangle(polygon, rectangle):
+    """It blocks the edges of polygons, as the edges of rectangles."""
+    from_polygon = ObstacleMap(polygons=[polygon])
+    from_rectangle = ObstacleMap(rectangles=[rectangle])
+
+    for x in range(-1, 7):
+        for y in range(-1, 7):
+            cell = Coordinates(x, y)
+            assert from_polygon.is_blocked(cell) == from_rectangle.is_blocked(cell)
+            for heading in Heading:
+                assert from_polygon.free_run(cell, heading) == from_rectangle.free_run(
+                    cell, heading
+                )
+
+
+def test_the_cells_on_the_edges_of_a_polygon_are_blocked():
+    """It blocks the cells on vertical and slanted edges."""
+    obstacles = ObstacleMap(
+        polygons=[[(4, 0), (5, 0), (5, 2)], [(0, 0), (3, 9), (0, 9)]]
+    )
+
+    blocked = {
+        (x, y)
+        for x in range(7)
+        for y in range(10)
+        if obstacles.is_blocked(Coordinates(x, y))
+    }
+
+    assert {(4, 0), (5, 0), (5, 1), (5, 2)} <= blocked
+    assert {(1, 3), (2, 6), (3, 9), (0, 0)} <= blocked
+    assert (1, 2) not in blocked
+    assert (4, 1) not in blocked
+
+
+@pytest.mark.parametrize(
+    "coordinates, heading, expected_run",
+    [
+        (Coordinates(2, 0), Heading.NORTH, 1),
+        (Coordinates(2, 9), Heading.SOUTH, 4),
+        (Coordinates(0, 3), Heading.EAST, 0),
+        (Coordinates(9, 3), Heading.WEST, 5),
+        (Coordinates(2, 6), Heading.NORTH, 3),
+        (Coordinates(7, 7), Heading.EAST, None),
+    ],
+)
+def test_the_free_run_stops_before_the_next_obstacle(
+    coordinates, heading, expected_run
+):
+    """It counts the free cells before an obstacle, or None without them."""
+    obstacles = ObstacleMap(rectangles=[(1, 2, 3, 4), (2, 10, 2, 10)])
+
+    assert obstacles.free_run(coordinates, heading) == expected_run
+
+
+def test_a_mower_cannot_move_into_an_obstacle():
+    """It raises an exception when moving into an obstacle."""
+    plateau = Plateau(5, 5, obstacles=ObstacleMap(rectangles=[(1, 3, 2, 4)]))
+    mower = Mower(uuid.uuid4(), Coordinates(1, 2), Heading.NORTH, plateau)
+
+    with pytest.raises(InvalidMovementError) as exim:
+        mower.move(Movement.MOVE_FORWARD)
+
+    assert exim.value.args[0] == "'Coordinates(x=1, y=3)' blocked by an obstacle"
+
+
+@pytest.mark.parametrize(
+    "start, steps, expected_location, error",
+    [
+        (Coordinates(0, 0), 3, Coordinates(0, 3), None),
+        (Coordinates(1, 0), 5, Coordinates(1, 2), "blocked by an obstacle"),
+        (Coordinates(3, 0), 9, Coordinates(3, 3), "already occupied"),
+        (Coordinates(5, 0), 9, Coordinates(5, 5), "out of plateau"),
+    ],
+)
+def test_moving_forward_several_cells_stops_like_single_movements(
+    start, steps, expected_location, error
+):
+    """It leaves the Mower at the last valid cell and raises the same error."""
+    plateau = Plateau(5, 5, obstacles=ObstacleMap(rectangles=[(1, 3, 2, 4)]))
+    Mower(uuid.uuid4(), Coordinates(3, 4), Heading.NORTH, plateau)
+    mower = Mower(uuid.uuid4(), start, Heading.NORTH, plateau)
+
+    if error is None:
+        mower.move_forward(steps)
+    else:
+        with pytest.raises(InvalidMovementError, match=error):
+            mower.move_forward(steps)
+
+    assert mower.location == expected_location
+    assert plateau._coordinates[expected_location] is mower
+
+
+def test_process_input_reads_the_obstacles():
+    """It avoids the obstacles of the input."""
+    output = process_input("5 5\nO 1 4 2 5\nP 4 0 5 0 5 2\n1 2 N\nM\n0 4 E\nRM\n")
+
+    assert output == "1 3 N\n0 3 S\n"
+
+
+@pytest.mark.parametrize(
+    "mowers_input",
+    ["5 5\nO 1 4 2\n1 2 N\nM\n", "5 5\nP 1 1 2 2\n1 2 N\nM\n", "5 5\nO a\n"],
+)
+def test_process_input_with_invalid_obstacles_raises_an_exception(mowers_input):
+    """It raises an exception when an obstacle cannot be read."""
+    with pytest.raises(InvalidInputError):
+        process_input(mowers_input)
+
+
+def test_it_gives_the_blocked_intervals_and_bounds_of_the_obstacles():
+    """It lists the blocked cells of a column and the extent of the obstacles."""
+    obstacles = ObstacleMap([(3, 4, 1, 2), (2, 6, 2, 7)], [[(0, 0), (2, 0), (0, 2)]])
+
+    assert obstacles.blocked_intervals(2) == [(0, 0), (2, 4), (6, 7)]
+    assert obstacles.blocked_intervals(5) == []
+    assert obstacles.bounds == [(1, 2, 3, 4), (2, 6, 2, 7), (0, 0, 2, 2)]
@@ -0,0 +1,67 @@
+"""Tests for the output module."""
+import os
+
+from src.seat_code_mowers.domain import Heading
+from src.seat_code_mowers.output import BytearraySink
+from src.seat_code_mowers.output import format_status
+from src.seat_code_mowers.output import ListSink
+from src.seat_code_mowers.output import StreamSink
+
+
+def test_format_status_returns_the_status_line():
+    """It formats the coordinates and the heading letter."""
+    assert format_status(1, 2, Heading.NORTH) == b"1 2 N\n"
+
+
+def test_list_sink_joins_the_status_lines():
+    """It returns all the status lines as text."""
+    sink = ListSink()
+    sink.write_status(1, 3, Heading.NORTH)
+    sink.write_status(5, 1, Heading.EAST)
+
+    assert sink.getvalue() == "1 3 N\n5 1 E\n"
+
+
+def test_bytearray_sink_grows_when_full_and_can_be_reused():
+    """It keeps writing beyond the initial size and can be cleared."""
+    sink = BytearraySink(size_hint=4)
+    for _ in range(100):
+        sink.write_status(10, 20, Heading.WEST)
+
+    assert sink.getvalue() == b"10 20 W\n" * 100
+
+    sink.clear()
+    sink.write_status(0, 0, Heading.SOUTH)
+
+    assert sink.getvalue() == b"0 0 S\n"
+
+
+def test_stream_sink_writes_in_bounded_chunks(tmp_path):
+    """It writes to the stream when the buffer is full and when flushed."""
+    path = tmp_path / "output.txt"
+    with path.open("wb") as stream:
+        sink = StreamSink(stream, buffer_size=12)
+        sink.write_status(1, 3, Heading.NORTH)
+        sink.write_status(5, 1, Heading.EAST)
+        stream.flush()
+
+        assert path.read_bytes() == b"1 3 N\n5 1 E\n"
+
+        sink.write_status(0, 0, Heading.SOUTH)
+        sink.flush()
+
+    assert path.read_bytes() == b"1 3 N\n5 1 E\n0 0 S\n"
+
+
+def test_stream_sink_writes_to_a_file_descriptor(tmp_path):
+    """It writes directly to a file descriptor."""
+    path = tmp_path / "output.txt"
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT)
+    try:
+        sink = StreamSink(fd)
+        sink.write_status(1, 3, Heading.NORTH)
+        sink.flush()
+    finally:
+        os.close(fd)
+
+    assert path.read_bytes() == b"1 3 N\n"
@@ -0,0 +1,237 @@
+"""Tests for the planner module."""
+from collections import deque
+
+import pytest
+from hypothesis import given
+from hypothesis import settings
+from hypothesis import strategies as st
+from src.seat_code_mowers.domain import Coordinates
+from src.seat_code_mowers.domain import Heading
+from src.seat_code_mowers.domain import Plateau
+from src.seat_code_mowers.obstacles import ObstacleMap
+from src.seat_code_mowers.planner import plan_coverage
+from src.seat_code_mowers.service import MowerService
+
+
+def _execute(plateau, starts, plans):
+    mower_service = MowerService()
+    for (location, heading), plan in zip(starts, plans):
+        mower_id = mower_service.create_mower(
+            heading.value,
+            (location.x, location.y),
+            (plateau.upper_right_x, plateau.upper_right_y),
+            record_coverage=True,
+            obstacles=plateau.obstacles,
+        )
+        mower_service.send_instructions(mower_id, plan)
+    return mower_service.get_fleet_coverage()
+
+
+def _blocked(plateau, x, y):
+    obstacles = plateau.obstacles
+    return obstacles is not None and obstacles.is_blocked(Coordinates(x, y))
+
+
+def _reachable(plateau, start):
+    reached = {start}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for near in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if (
+                near not in reached
+                and 0 <= near[0] <= plateau.upper_right_x
+                and 0 <= near[1] <= plateau.upper_right_y
+                and not _blocked(plateau, *near)
+            ):
+                reached.add(near)
+                queue.append(near)
+    return reached
+
+
+def test_a_plan_covers_the_whole_plateau():
+    """It covers every cell of a plateau without obstacles."""
+    plateau = Plateau(9, 6)
+    starts = [
+        (Coordinates(0, 0), Heading.NORTH),
+        (Coordinates(9, 6), Heading.SOUTH),
+        (Coordinates(4, 3), Heading.WEST),
+    ]
+
+    plans = plan_coverage(plateau, starts)
+    coverage = _execute(plateau, starts, plans)
+
+    assert len(plans) == 3
+    assert coverage.percentage == 100.0
+
+
+def test_the_plans_split_the_work_between_the_mowers():
+    """It keeps the longest plan close to an even split of the work."""
+    plateau = Plateau(39, 39)
+    alone = plan_coverage(plateau, [(Coordinates(0, 0), Heading.NORTH)])
+    starts = [(Coordinates(x, 0), Heading.NORTH) for x in range(0, 40, 10)]
+
+    plans = plan_coverage(plateau, starts)
+
+    assert max(map(len, plans)) < len(alone[0]) / 4 * 1.2
+
+
+def test_a_plan_goes_around_the_obstacles():
+    """It covers the free cells and never enters an obstacle."""
+    plateau = Plateau(
+        9, 7, obstacles=ObstacleMap([(2, 2, 3, 4), (6, 0, 6, 3), (8, 6, 9, 7)])
+    )
+    starts = [
+        (Coordinates(0, 0), Heading.NORTH),
+        (Coordinates(9, 0), Heading.WEST),
+    ]
+
+    coverage = _execute(plateau, starts, plan_coverage(plateau, starts))
+
+    for x in range(10):
+        for y in range(8):
+            assert coverage.is_covered(Coordinates(x, y)) != _blocked(plateau, x, y)
+
+
+def test_a_plan_goes_around_polygons():
+    """It avoids the no-go zones of the plateau given as polygons."""
+    plateau = Plateau(
+        5, 5, obstacles=ObstacleMap([(1, 1, 3, 3)], [[(5, 0), (5, 2), (3, 0)]])
+    )
+    starts = [(Coordinates(0, 0), Heading.NORTH)]
+
+    coverage = _execute(plateau, starts, plan_coverage(plateau, starts))
+
+    for x in range(6):
+        for y in range(6):
+            assert coverage.is_covered(Coordinates(x, y)) != _blocked(plateau, x, y)
+
+
+@pytest.mark.parametrize(
+    "plateau, starts",
+    [
+        (
+            Plateau(2, 2, obstacles=ObstacleMap([(1, 1, 1, 1), (0, 2, 0, 2)])),
+            [(Coordinates(2, 1), Heading.NORTH)],
+        ),
+        (
+            Plateau(2, 3, obstacles=ObstacleMap([(1, 1, 1, 2), (0, 1, 1, 1)])),
+            [
+                (Coordinates(1, 0), Heading.NORTH),
+                (Coordinates(0, 0), Heading.NORTH),
+            ],
+        ),
+    ],
+)
+def test_a_plan_searches_its_way_around_obstacles(plateau, starts):
+    """It searches the strip, then the whole plateau, for a way around."""
+    coverage = _execute(plateau, starts, plan_coverage(plateau, starts))
+
+    for x in range(plateau.upper_right_x + 1):
+        for y in range(plateau.upper_right_y + 1):
+            assert coverage.is_covered(Coordinates(x, y)) != _blocked(plateau, x, y)
+
+
+def test_every_area_is_covered_by_its_mowers():
+    """It covers the areas split by obstacles with the Mowers inside them."""
+    plateau = Plateau(1, 11, obstacles=ObstacleMap([(0, 4, 1, 8), (1, 8, 1, 9)]))
+    starts = [
+        (Coordinates(1, 2), Heading.NORTH),
+        (Coordinates(1, 0), Heading.NORTH),
+        (Coordinates(1, 10), Heading.NORTH),
+        (Coordinates(0, 11), Heading.NORTH),
+    ]
+
+    coverage = _execute(plateau, starts, plan_coverage(plateau, starts))
+
+    for x in range(2):
+        for y in range(12):
+            assert coverage.is_covered(Coordinates(x, y)) != _blocked(plateau, x, y)
+
+
+def test_an_area_without_mowers_is_not_covered():
+    """It leaves out the cells no Mower can reach."""
+    plateau = Plateau(4, 0, obstacles=ObstacleMap([(2, 0, 2, 0)]))
+    starts = [(Coordinates(0, 0), Heading.EAST)]
+
+    plans = plan_coverage(plateau, starts)
+
+    assert plans == ["M"]
+
+
+def test_a_mower_without_a_strip_stays_still():
+    """It leaves the Mowers in excess of the columns of their area idle."""
+    plateau = Plateau(0, 3)
+    starts = [
+        (Coordinates(0, 0), Heading.NORTH),
+        (Coordinates(0, 3), Heading.NORTH),
+    ]
+
+    plans = plan_coverage(plateau, starts)
+
+    assert plans == ["MMM", ""]
+
+
+@pytest.mark.parametrize(
+    "start", [Coordinates(2, 3), Coordinates(-1, 0), Coordinates(0, 8)]
+)
+def test_a_start_out_of_the_free_cells_raises_an_exception(start):
+    """It raises an exception when a Mower starts in an obstacle or outside."""
+    with pytest.raises(ValueError):
+        plan_coverage(
+            Plateau(7, 7, obstacles=ObstacleMap([(2, 2, 3, 4)])),
+            [(start, Heading.NORTH)],
+        )
+
+
+def test_a_plan_without_mowers_is_empty():
+    """It returns no plans when there are no Mowers."""
+    assert plan_coverage(Plateau(5, 5), []) == []
+
+
+@st.composite
+def fields(draw):
+    """A small plateau with rectangular and triangular obstacles and free starts."""
+    upper_right_x, upper_right_y = draw(st.integers(0, 12)), draw(st.integers(0, 12))
+    corners_x = st.integers(0, upper_right_x)
+    corners_y = st.integers(0, upper_right_y)
+    corners = st.tuples(corners_x, corners_y)
+    rectangles = draw(
+        st.lists(st.tuples(corners_x, corners_y, corners_x, corners_y), max_size=4)
+    )
+    triangles = draw(st.lists(st.lists(corners, min_size=3, max_size=3), max_size=2))
+    plateau = Plateau(
+        upper_right_x,
+        upper_right_y,
+        obstacles=ObstacleMap(rectangles, triangles),
+    )
+    free = [
+        (x, y)
+        for x in range(upper_right_x + 1)
+        for y in range(upper_right_y + 1)
+        if not _blocked(plateau, x, y)
+    ]
+    if not free:
+        plateau, free = Plateau(upper_right_x, upper_right_y), [(0, 0)]
+    cells = draw(st.lists(st.sampled_from(free), min_size=1, max_size=4))
+    starts = [(Coordinates(x, y), draw(st.sampled_from(Heading))) for x, y in cells]
+    return plateau, starts
+
+
+@settings(max_examples=100, deadline=None)
+@given(fields())
+def test_plans_are_valid_and_cover_the_reachable_cells(field):
+    """It covers every cell reachable by any Mower, avoiding obstacles."""
+    plateau, starts = field
+
+    coverage = _execute(plateau, starts, plan_coverage(plateau, starts))
+
+    reachable = set.union(
+        *(_reachable(plateau, (c.x, c.y)) for c, _ in starts)
+    )
+    for x, y in reachable:
+        assert coverage.is_covered(Coordinates(x, y))
+    for x in range(plateau.upper_right_x + 1):
+        for y in range(plateau.upper_right_y + 1):
+            if _blocked(plateau, x, y):
+                assert not coverage.is_covered(Coordinates(x, y))
@@ -1,9 +1,14 @@
 """Tests for services of Mowers challenge."""
+import io
+import logging
+import sys
+import threading
 from uuid import UUID
 
 import pytest
 from src.seat_code_mowers.exceptions import MowerNotFoundError
 from src.seat_code_mowers.service import MowerService
+from src.seat_code_mowers.trajectory import TrajectoryWriter
 
 
 def test_mower_service_creates_a_mower_ok(mocker):
@@ -72,3 +77,144 @@ def test_when_getting_status_from_mower_not_found_it_should_raise_an_exception()
 
     with pytest.raises(MowerNotFoundError):
         mower_service.get_mower_status("7d558c83-abbc-4614-8832-8b2b452f9288")
+
+
+def test_get_mower_coverage_after_sending_instructions():
+    """It returns the cells covered by a Mower."""
+    mower_service = MowerService()
+    mower_id = mower_service.create_mower(
+        heading="N", coordinates=(1, 2), plateau=(5, 5), record_coverage=True
+    )
+
+    mower_service.send_instructions(mower_id, "MMM")
+    coverage = mower_service.get_mower_coverage(mower_id)
+
+    assert coverage.covered_cells == 4
+
+
+def test_get_mower_coverage_when_not_recording_raises_an_exception():
+    """It raises an exception when the Mower isn't recording its coverage."""
+    mower_service = MowerService()
+    mower_id = mower_service.create_mower(
+        heading="N", coordinates=(1, 2), plateau=(5, 5)
+    )
+
+    with pytest.raises(ValueError):
+        mower_service.get_mower_coverage(mower_id)
+
+
+def test_get_fleet_coverage_merges_the_coverage_of_the_mowers():
+    """It returns the union of the cells covered by the Mowers."""
+    mower_service = MowerService()
+    first_id = mower_service.create_mower(
+        heading="E", coordinates=(0, 0), plateau=(1, 1), record_coverage=True
+    )
+    second_id = mower_service.create_mower(
+        heading="N", coordinates=(1, 0), plateau=(1, 1), record_coverage=True
+    )
+    mower_service.send_instructions(first_id, "M")
+    mower_service.send_instructions(second_id, "M")
+
+    coverage = mower_service.get_fleet_coverage()
+
+    assert coverage.covered_cells == 3
+    assert coverage.overlap == 1
+
+
+def test_a_thread_safe_service_does_not_lose_movements():
+    """It applies all the instructions sent to a Mower from several threads."""
+    mower_service = MowerService(thread_safe=True)
+    mower_id = mower_service.create_mower(
+        heading="E", coordinates=(0, 0), plateau=(1000, 0)
+    )
+
+    threads = [
+        threading.Thread(
+            target=mower_service.send_instructions, args=(mower_id, "M" * 100)
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert mower_service.get_mower_status(mower_id) == "800 0 E"
+
+
+def test_it_logs_the_instructions_in_debug(caplog):
+    """It logs every run of instructions sent when debugging."""
+    mower_service = MowerService()
+    mower_id = mower_service.create_mower("N", (3, 2), (5, 5))
+
+    with caplog.at_level(logging.DEBUG, logger="src.seat_code_mowers.service"):
+        mower_service.send_instructions(mower_id, "LMMR")
+
+    assert [record.getMessage() for record in caplog.records] == [
+        f"Sending Mower '{mower_id}' instructions 'L'",
+        f"Sending Mower '{mower_id}' instructions 'MM'",
+        f"Sending Mower '{mower_id}' instructions 'R'",
+    ]
+
+
+def test_it_logs_every_traced_instruction_in_debug(caplog):
+    """It logs the instructions one by one when tracing them."""
+    mower_service = MowerService()
+    mower_id = mower_service.create_mower("N", (3, 2), (5, 5))
+
+    with caplog.at_level(logging.DEBUG, logger="src.seat_code_mowers.service"):
+        mower_service.send_instructions(
+            mower_id, "LM", TrajectoryWriter(io.BytesIO())
+        )
+
+    assert [record.getMessage() for record in caplog.records] == [
+        f"Sending Mower '{mower_id}' instruction 'L'",
+        f"Sending Mower '{mower_id}' instruction 'M'",
+    ]
+
+
+def test_it_does_not_import_logging_to_send_instructions(monkeypatch):
+    """It doesn't log when logging isn't imported, it can't be configured."""
+    monkeypatch.delitem(sys.modules, "logging")
+    mower_service = MowerService()
+    mower_id = mower_service.create_mower("N", (1, 2), (5, 5))
+
+    mower_service.send_instructions(mower_id, "LM")
+
+    assert "logging" not in sys.modules
+    assert mower_service.get_mower_status(mower_id) == "0 2 W"
+
+
+@pytest.mark.parametrize("read", ["get_fleet_coverage", "fork"])
+def test_a_thread_safe_service_can_create_mowers_while_reading_the_fleet(read):
+    """It reads all the Mowers while another thread creates them."""
+    mower_service = MowerService(thread_safe=True)
+    mower_service.create_mower("N", (0, 0), (5, 5), record_coverage=True)
+    created = threading.Event()
+    errors = []
+
+    def create():
+        for _ in range(5000):
+            mower_service.create_mower("N", (0, 0), (5, 5), record_coverage=True)
+        created.set()
+
+    def read_fleet():
+        try:
+            while not created.is_set():
+                getattr(mower_service, read)()
+        except RuntimeError as ex:  # pragma: no cover
+            errors.append(ex)
+            created.wait()
+
+    threads = [threading.Thread(target=create), threading.Thread(target=read_fleet)]
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Interleaves the threads as much as possible.
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert errors == []
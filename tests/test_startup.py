@@ -0,0 +1,63 @@
+"""Tests for the startup cost of the package."""
+import os
+import subprocess  # noqa: S404
+import sys
+
+
+# The import of the input processor is measured against the import of the
+# standard library modules the Mowers are built on, so the budget holds on
+# slow CI runners too. Both take about 12ms and 9ms on a developer machine,
+# the margin catches one more heavy import like logging or a test framework.
+REFERENCE_MODULES = ("dataclasses", "uuid")
+IMPORT_TIME_MARGIN = 1.5
+RUNS = 5
+PACKAGE = "src.seat_code_mowers"
+
+
+def _import_times(*modules):
+    # Imports are measured with their bytecode cached, as once installed.
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines()[1:]:
+        _, cumulative_us, name = line.partition(":")[2].split("|")
+        times[name.strip()] = int(cumulative_us)
+    return times
+
+
+def _best_times(*imports):
+    # The imports are measured in turns, so a slow spell slows all of them.
+    best_times = [float("inf")] * len(imports)
+    for _ in range(RUNS):
+        for index, modules in enumerate(imports):
+            times = _import_times(*modules)
+            best_time = sum(times[module] for module in modules)
+            best_times[index] = min(best_times[index], best_time)
+    return best_times
+
+
+def test_importing_the_input_processor_is_within_budget():
+    """It spends little more than the standard library it's built on."""
+    module = f"{PACKAGE}.input_processor"
+    _import_times(module)  # Caches the bytecode.
+
+    reference, import_time = _best_times(REFERENCE_MODULES, (module,))
+
+    assert import_time < reference * IMPORT_TIME_MARGIN
+
+
+def test_importing_the_input_processor_does_not_load_optional_engines():
+    """It loads the optional modules only when they're used."""
+    times = _import_times(f"{PACKAGE}.input_processor")
+
+    assert f"{PACKAGE}.coverage" not in times
+    assert f"{PACKAGE}.output" not in times
+    assert f"{PACKAGE}.worker" not in times
+    assert "logging" not in times
+    assert "socketserver" not in times
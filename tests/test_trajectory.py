@@ -0,0 +1,121 @@
+"""Tests for the trajectory module."""
+import io
+import uuid
+
+import pytest
+from src.seat_code_mowers.domain import Coordinates
+from src.seat_code_mowers.domain import Heading
+from src.seat_code_mowers.domain import Movement
+from src.seat_code_mowers.domain import Mower
+from src.seat_code_mowers.domain import Plateau
+from src.seat_code_mowers.exceptions import InvalidMovementError
+from src.seat_code_mowers.exceptions import InvalidTraceError
+from src.seat_code_mowers.input_processor import process_input
+from src.seat_code_mowers.service import MowerService
+from src.seat_code_mowers.trajectory import TrajectoryReader
+from src.seat_code_mowers.trajectory import TrajectoryWriter
+
+
+def _expected_trajectory(location, heading, instructions):
+    mower = Mower(uuid.uuid4(), location, heading, Plateau(50, 50))
+    states = [(mower.location, mower.heading)]
+    for instruction in instructions:
+        mower.move(Movement(instruction))
+        states.append((mower.location, mower.heading))
+    return states
+
+
+@pytest.mark.parametrize("instructions", ["", "LMLMLMLMM", "MMRMMRMRRM" * 10])
+def test_the_reader_returns_the_states_written(instructions):
+    """It reads back every state of the trajectory."""
+    stream = io.BytesIO()
+    mower_service = MowerService()
+    mower_id = mower_service.create_mower("N", (10, 10), (50, 50))
+    mower_service.send_instructions(
+        mower_id, instructions, TrajectoryWriter(stream, keyframe_interval=8)
+    )
+
+    reader = TrajectoryReader(io.BytesIO(stream.getvalue()))
+    expected = _expected_trajectory(Coordinates(10, 10), Heading.NORTH, instructions)
+
+    assert reader.mowers == 1
+    assert reader.steps(0) == len(instructions)
+    assert list(reader.trajectory(0)) == expected
+    assert [reader.state_at(0, step) for step in range(len(expected))] == expected
+
+
+def test_the_movements_are_packed_in_two_bits():
+    """It writes 4 movements per byte plus a keyframe per block."""
+    stream = io.BytesIO()
+    writer = TrajectoryWriter(stream, keyframe_interval=256)
+    writer.begin(Coordinates(0, 0), Heading.NORTH)
+    for _ in range(512):
+        writer.record(Movement.LEFT_90_DEGREES, Coordinates(0, 0), Heading.NORTH)
+    writer.end()
+
+    assert len(stream.getvalue()) == 7 + 2 * (15 + 64)
+
+
+def test_short_trajectories_take_only_the_bytes_of_their_movements():
+    """It writes the movements of a short trajectory without padding."""
+    stream = io.BytesIO()
+
+    process_input("5 5\n" + "1 2 N\nLMLMLMLMM\n" * 100, stream)
+
+    assert len(stream.getvalue()) == 7 + 100 * (15 + 3)
+    reader = TrajectoryReader(io.BytesIO(stream.getvalue()))
+    assert reader.state_at(99, 9) == (Coordinates(1, 3), Heading.NORTH)
+
+
+def test_process_input_writes_the_trajectory_of_every_mower():
+    """It traces all the Mowers of the input."""
+    stream = io.BytesIO()
+
+    process_input("5 5\n1 2 N\nLMLMLMLMM\n3 3 E\nMMRMMRMRRM\n", stream)
+    reader = TrajectoryReader(io.BytesIO(stream.getvalue()))
+
+    assert reader.mowers == 2
+    assert reader.state_at(0, 9) == (Coordinates(1, 3), Heading.NORTH)
+    assert reader.state_at(1, 10) == (Coordinates(5, 1), Heading.EAST)
+
+
+def test_the_trace_keeps_the_movements_before_an_invalid_one():
+    """It writes the trajectory until the Mower failed to move."""
+    stream = io.BytesIO()
+    mower_service = MowerService()
+    mower_id = mower_service.create_mower("N", (0, 4), (5, 5))
+
+    with pytest.raises(InvalidMovementError):
+        mower_service.send_instructions(mower_id, "MMM", TrajectoryWriter(stream))
+    reader = TrajectoryReader(io.BytesIO(stream.getvalue()))
+
+    assert reader.steps(0) == 1
+    assert reader.state_at(0, 1) == (Coordinates(0, 5), Heading.NORTH)
+
+
+@pytest.mark.parametrize("mower, step", [(1, 0), (0, 2), (0, -1)])
+def test_reading_a_missing_step_raises_an_exception(mower, step):
+    """It raises an exception for Mowers or steps not in the trace."""
+    stream = io.BytesIO()
+    process_input("5 5\n1 2 N\nM\n", stream)
+    reader = TrajectoryReader(io.BytesIO(stream.getvalue()))
+
+    with pytest.raises(InvalidTraceError):
+        reader.state_at(mower, step)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"", b"NOPE\x02\x01\x00", b"MWTR\x01\x00\x08", b"MWTR\x02\x00\x08\x00"],
+)
+def test_reading_an_invalid_trace_raises_an_exception(data):
+    """It raises an exception when the stream is not a trace."""
+    with pytest.raises(InvalidTraceError):
+        TrajectoryReader(io.BytesIO(data))
+
+
+@pytest.mark.parametrize("keyframe_interval", [0, 6, 65536])
+def test_an_invalid_keyframe_interval_raises_an_exception(keyframe_interval):
+    """It raises an exception when the interval can't be packed in bytes."""
+    with pytest.raises(ValueError):
+        TrajectoryWriter(io.BytesIO(), keyframe_interval)
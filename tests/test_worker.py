@@ -0,0 +1,88 @@
+"""Tests for the worker module."""
+import os
+import socket
+import threading
+
+import pytest
+from src.seat_code_mowers.exceptions import InvalidInputError
+from src.seat_code_mowers.exceptions import InvalidMovementError
+from src.seat_code_mowers.exceptions import MowerBaseError
+from src.seat_code_mowers.worker import create_server
+from src.seat_code_mowers.worker import serve
+from src.seat_code_mowers.worker import submit
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    """Path of a running worker, stopped when the test finishes."""
+    path = str(tmp_path / "mowers.sock")
+    server = create_server(path)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield path
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_submit_returns_the_output_of_the_mission(socket_path):
+    """It processes the mission in the worker."""
+    output = submit(socket_path, "5 5\n1 2 N\nLMLMLMLMM\n3 3 E\nMMRMMRMRRM\n")
+
+    assert output == "1 3 N\n5 1 E\n"
+
+
+def test_the_worker_serves_several_missions(socket_path):
+    """It keeps processing missions after the first one."""
+    outputs = [submit(socket_path, "5 5\n0 0 N\nMM\n") for _ in range(3)]
+
+    assert outputs == ["0 2 N\n"] * 3
+
+
+@pytest.mark.parametrize(
+    "mission, error",
+    [("asdasd", InvalidInputError), ("5 5\n0 0 S\nM\n", InvalidMovementError)],
+)
+def test_submit_raises_the_error_of_the_worker(socket_path, mission, error):
+    """It raises the same error the worker found."""
+    with pytest.raises(error):
+        submit(socket_path, mission)
+
+
+def test_submit_raises_errors_from_outside_the_package(socket_path):
+    """It raises the errors of the worker not defined by the package."""
+    with pytest.raises(MowerBaseError, match="^ValueError: 'X' is not a valid"):
+        submit(socket_path, "5 5\n1 2 N\nMX\n")
+
+    assert submit(socket_path, "5 5\n0 0 N\nM\n") == "0 1 N\n"
+
+
+def test_a_worker_replaces_a_stale_socket(tmp_path):
+    """It removes the socket left by a stopped worker before binding."""
+    path = str(tmp_path / "mowers.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+        stale.bind(path)
+
+    with create_server(path) as server:
+        assert server.server_address == path
+
+
+def test_a_worker_does_not_replace_a_live_socket(socket_path):
+    """It refuses to bind the socket of a running worker."""
+    with pytest.raises(OSError):
+        create_server(socket_path)
+
+    assert submit(socket_path, "5 5\n0 0 N\nM\n") == "0 1 N\n"
+
+
+def test_serve_removes_the_socket_when_stopped(tmp_path, mocker):
+    """It unlinks the socket when the worker stops."""
+    path = str(tmp_path / "mowers.sock")
+    mocker.patch(
+        "socketserver.BaseServer.serve_forever", side_effect=KeyboardInterrupt
+    )
+
+    with pytest.raises(KeyboardInterrupt):
+        serve(path)
+
+    assert not os.path.exists(path)